@@ -9,9 +9,12 @@
 # SPDX-License-Identifier: BSD-3-Clause
 """ SerDes backend for the Artix7. """
 
+import functools
+import math
+
 from nmigen import *
 from nmigen.hdl.rec import DIR_FANIN, DIR_FANOUT
-from nmigen.lib.cdc import FFSynchronizer, ResetSynchronizer
+from nmigen.lib.cdc import FFSynchronizer, PulseSynchronizer, ResetSynchronizer
 
 
 from .soft                        import Encoder
@@ -24,10 +27,61 @@ from ....usb.usb3.physical.coding import *
 DIR_C_TO_P = DIR_FANOUT
 DIR_P_TO_C = DIR_FANIN
 
+# The 8B10B substitution character, frozen as shared constants; these are referenced
+# per received byte, in every elaboration of the Rx datapath.
+_SUB_VALUE = Const(SUB.value, 8)
+_SUB_CTRL  = Const(SUB.ctrl, 1)
+
+
+# Vivado constraints for our clock-domain-crossing synchronizers: keep the tagged
+# synchronizer flops where the tools can't mangle them apart, and exempt the
+# asynchronous crossing itself from static timing analysis.
+_CDC_CONSTRAINTS = (
+    "set_property DONT_TOUCH true [get_cells -hier -filter {nmigen_async_ff==TRUE}]\n"
+    "set_false_path -to [get_cells -hier -filter {nmigen_async_ff==TRUE}]\n"
+)
+
+
+class XilinxFFSynchronizer(Elaboratable):
+    """ Two-stage flop synchronizer tagged for Vivado CDC handling.
+
+    Functionally equivalent to nMigen's FFSynchronizer; additionally marks its first
+    stage with the ``nmigen_async_ff`` attribute, which our constraints use to pin the
+    synchronizer flops in place and to skip timing analysis across the async edge.
+    """
+
+    def __init__(self, i, o, *, o_domain="sync", stages=2):
+        self.i = i
+        self.o = o
+
+        self._o_domain = o_domain
+        self._stages   = stages
+
+
+    def elaborate(self, platform):
+        m = Module()
+
+        flops = [
+            Signal(self.i.shape(), name=f"stage{index}", reset_less=True,
+                attrs=({"nmigen_async_ff": "TRUE"} if index == 0 else {}))
+            for index in range(self._stages)
+        ]
+        for i, o in zip((self.i, *flops), flops):
+            m.d[self._o_domain] += o.eq(i)
+        m.d.comb += self.o.eq(flops[-1])
+
+        # Emit the matching CDC constraints, where our platform supports extra files.
+        if hasattr(platform, "add_file"):
+            platform.add_file("bucatini_cdc.xdc", _CDC_CONSTRAINTS)
+
+        return m
+
 
 class WaitTimer(Elaboratable):
-    def __init__(self, t):
-        self._t   = t
+    def __init__(self, t, *, prescale=1):
+        self._t        = t
+        self._prescale = prescale
+
         self.wait = Signal()
         self.done = Signal()
 
@@ -36,13 +90,37 @@ class WaitTimer(Elaboratable):
         m = Module()
 
         count = Signal(range(self._t + 1), reset=self._t)
-        m.d.comb += self.done.eq(count == 0)
+        done  = Signal()
+        m.d.comb += self.done.eq(done)
+
+        # If requested, divide our time base down with a small prescaler, so long waits
+        # don't need a wide main counter.
+        if self._prescale > 1:
+            prescaler = Signal(range(self._prescale))
+            tick      = Signal()
+            m.d.comb += tick.eq(prescaler == self._prescale - 1)
+
+            with m.If(self.wait & ~done):
+                m.d.ss += prescaler.eq(Mux(tick, 0, prescaler + 1))
+            with m.Else():
+                m.d.ss += prescaler.eq(0)
+        else:
+            tick = Const(1)
 
+        # Count down from our delay, registering `done` in the same cycle as the final
+        # decrement; this keeps the counter comparator off the (potentially large)
+        # fanout to our consumers, which now see only a single flop.
         with m.If(self.wait):
-            with m.If(~self.done):
-                m.d.ss += count.eq(count + 1)
+            with m.If(~done & tick):
+                m.d.ss += [
+                    count.eq(count - 1),
+                    done.eq(count == 1)
+                ]
         with m.Else():
-            m.d.ss += count.eq(count.reset)
+            m.d.ss += [
+                count.eq(count.reset),
+                done.eq(0)
+            ]
 
         return m
 
@@ -62,6 +140,14 @@ class DRPInterface(Record):
 
 
 class DRPMux(Elaboratable, DRPInterface):
+    """ Arbitrates a single DRP port between multiple requesters.
+
+    The DRP is granted automatically: the first interface (in registration order) to
+    strobe ``en`` owns the port until its transaction's ``rdy`` response. Driving
+    ``sel`` to a nonzero value bypasses arbitration and forces a combinational
+    connection to interface ``sel - 1``; this is intended for debug use only.
+    """
+
     def __init__(self, **kwargs):
         DRPInterface.__init__(self, **kwargs)
         self.sel = Signal(4)
@@ -71,19 +157,95 @@ class DRPMux(Elaboratable, DRPInterface):
         self.interfaces.append(interface)
 
     def elaborate(self, platform):
-        assert len(self.interfaces) <= 16
+        interfaces = self.interfaces
+        assert len(interfaces) <= 15
 
         m = Module()
 
-        with m.Switch(self.sel):
-            for i, interface in enumerate(self.interfaces):
-                with m.Case(i):
-                    m.d.comb += interface.connect(self)
+        # The DRP endpoints sit inside fixed-placement hard IP; registering the forward
+        # path here keeps FSM-state -> mux -> DRPEN/DRPWE/DRPDI from becoming one long
+        # combinational path to a pin we can't move. The extra cycle of DRP latency is
+        # invisible, as every requester polls `rdy`.
+        en_r   = Signal.like(self.en)
+        we_r   = Signal.like(self.we)
+        addr_r = Signal.like(self.addr)
+        di_r   = Signal.like(self.di)
+
+        m.d.comb += [
+            self.clk  .eq(ClockSignal("ss")),
+            self.en   .eq(en_r),
+            self.we   .eq(we_r),
+            self.addr .eq(addr_r),
+            self.di   .eq(di_r)
+        ]
+
+        # `en` and `we` are single-cycle strobes; clear them unless re-driven below.
+        m.d.ss += [
+            en_r.eq(0),
+            we_r.eq(0)
+        ]
+
+        # One-hot transaction grant. Our requesters are mutually exclusive in time, so
+        # we grant the port to the first interface to strobe `en`, and hold that grant
+        # until the transaction's `rdy` response. A one-hot grant steers each signal
+        # through a flat AND-OR tree, rather than an encoded N-way mux.
+        grant = Signal(len(interfaces))
+        busy  = Signal()
+
+        with m.If(~busy):
+            # Iterate in reverse, so our lowest-numbered requester takes priority.
+            for index, interface in reversed(list(enumerate(interfaces))):
+                with m.If(interface.en):
+                    m.d.ss += [
+                        busy   .eq(1),
+                        grant  .eq(1 << index),
+
+                        en_r   .eq(1),
+                        we_r   .eq(interface.we),
+                        addr_r .eq(interface.addr),
+                        di_r   .eq(interface.di)
+                    ]
+        with m.Elif(self.rdy):
+            m.d.ss += [
+                busy  .eq(0),
+                grant .eq(0)
+            ]
+
+        # Response path: `do` can safely fan out to everyone; qualify `rdy` so only the
+        # transaction's owner sees its completion.
+        for index, interface in enumerate(interfaces):
+            m.d.comb += [
+                interface.do  .eq(self.do),
+                interface.rdy .eq(self.rdy & grant[index])
+            ]
+
+        # Debug override: a nonzero `sel` bypasses arbitration entirely, connecting
+        # interface `sel - 1` combinationally.
+        with m.If(self.sel != 0):
+            with m.Switch(self.sel):
+                for index, interface in enumerate(interfaces):
+                    with m.Case(index + 1):
+                        m.d.comb += [
+                            self.en       .eq(interface.en),
+                            self.we       .eq(interface.we),
+                            self.addr     .eq(interface.addr),
+                            self.di       .eq(interface.di),
+                            interface.rdy .eq(self.rdy),
+                            interface.do  .eq(self.do)
+                        ]
 
         return m
 
 
 class GTPTXInit(Elaboratable):
+    """ Startup sequencer for the GTP transmitter.
+
+    Runs in the ``ss`` domain. The optional DRP handshake (``drp_start``/``drp_done``)
+    is a request/acknowledge pulse pair carried in the ``drp`` domain, so an external
+    DRP sequencer is free to run at its own clock rate; if no sequencer is attached,
+    ``drp_start`` should be looped back into ``drp_done``.
+    """
+
     def __init__(self, ss_clock_frequency=125e6):
         self._ss_clock_frequency = ss_clock_frequency
 
@@ -93,6 +255,10 @@ class GTPTXInit(Elaboratable):
         self.done            = Signal()
         self.restart         = Signal()
 
+        # Post-configuration delay timer; shared with the other initialization FSMs.
+        self.init_delay_wait = Signal()
+        self.init_delay_done = Signal()
+
         # GTP signals
         self.plllock         = Signal()
         self.pllreset        = Signal()
@@ -108,9 +274,9 @@ class GTPTXInit(Elaboratable):
         self.txdlyen         = Signal()
         self.txuserrdy       = Signal()
 
-        # DRP (optional)
+        # DRP (optional); request/acknowledge pulses in the "drp" domain.
         self.drp_start       = Signal()
-        self.drp_done        = Signal(reset=1)
+        self.drp_done        = Signal()
 
 
     def elaborate(self, platform):
@@ -123,11 +289,11 @@ class GTPTXInit(Elaboratable):
         txphinitdone    = Signal()
         txphaligndone   = Signal()
         m.submodules += [
-            FFSynchronizer(self.plllock, plllock, o_domain="ss"),
-            FFSynchronizer(self.txresetdone, txresetdone, o_domain="ss"),
-            FFSynchronizer(self.txdlysresetdone, txdlysresetdone, o_domain="ss"),
-            FFSynchronizer(self.txphinitdone, txphinitdone, o_domain="ss"),
-            FFSynchronizer(self.txphaligndone, txphaligndone, o_domain="ss")
+            XilinxFFSynchronizer(self.plllock, plllock, o_domain="ss"),
+            XilinxFFSynchronizer(self.txresetdone, txresetdone, o_domain="ss"),
+            XilinxFFSynchronizer(self.txdlysresetdone, txdlysresetdone, o_domain="ss"),
+            XilinxFFSynchronizer(self.txphinitdone, txphinitdone, o_domain="ss"),
+            XilinxFFSynchronizer(self.txphaligndone, txphaligndone, o_domain="ss")
         ]
 
         # Deglitch FSM outputs driving transceiver asynch inputs
@@ -154,47 +320,80 @@ class GTPTXInit(Elaboratable):
         m.d.ss   += txphaligndone_r.eq(txphaligndone)
         m.d.comb += txphaligndone_rising.eq(txphaligndone & ~txphaligndone_r)
 
-        # Wait 500ns after configuration before releasing
-        # GTP reset (to follow AR43482)
-        init_delay = WaitTimer(int(500e-9*self._ss_clock_frequency))
-        m.submodules += init_delay
-        m.d.comb += init_delay.wait.eq(1)
+        # Request/acknowledge handshake with our (optional) external DRP sequencer.
+        # Carrying each side as a synchronized pulse lets the sequencer run on its
+        # own clock without any risk of metastability on the completion check.
+        m.submodules.drp_req_sync = drp_req = PulseSynchronizer("ss", "drp")
+        m.submodules.drp_ack_sync = drp_ack = PulseSynchronizer("drp", "ss")
 
+        drp_done = Signal(reset=1)
+        m.d.comb += [
+            self.drp_start .eq(drp_req.o),
+            drp_ack.i      .eq(self.drp_done)
+        ]
+        with m.If(drp_req.i):
+            m.d.ss += drp_done.eq(0)
+        with m.Elif(drp_ack.o):
+            m.d.ss += drp_done.eq(1)
+
+        # FSM watchdog / restart; prescaled, to keep the millisecond-range counter narrow.
+        # We restart by steering the FSM back to POWER-DOWN explicitly, rather than
+        # resetting the whole module, so the CDC synchronizers above (and their
+        # placement constraints) stay outside the reset net.
+        m.submodules.watchdog = watchdog = \
+            WaitTimer(int(1e-3*self._ss_clock_frequency) // 1024, prescale=1024)
+        reset_self = self.restart | watchdog.done
+        m.d.comb += watchdog.wait.eq(~reset_self & ~self.done)
 
-        with m.FSM(domain="ss"):
+        with m.FSM(domain="ss") as fsm:
             with m.State("POWER-DOWN"):
                 m.d.comb += [
                     gttxreset.eq(1),
                     gttxpd.eq(1),
                     self.pllreset.eq(1),
+                    drp_req.i.eq(1),
                 ]
                 m.next = "DRP"
 
+                with m.If(reset_self):
+                    m.next = "POWER-DOWN"
+
             with m.State("DRP",):
                 m.d.comb += [
                     gttxreset.eq(1),
                     self.pllreset.eq(1),
-                    self.drp_start.eq(1),
                 ]
-                with m.If(self.drp_done):
+                with m.If(drp_done):
                     m.next = "WAIT-PLL-RESET"
 
+                with m.If(reset_self):
+                    m.next = "POWER-DOWN"
+
 
             with m.State("WAIT-PLL-RESET"):
                 m.d.comb += gttxreset.eq(1)
                 with m.If(plllock):
                     m.next = "WAIT-INIT-DELAY"
 
+                with m.If(reset_self):
+                    m.next = "POWER-DOWN"
+
             with m.State("WAIT-INIT-DELAY"):
                 m.d.comb += gttxreset.eq(1)
-                with m.If(init_delay.done):
+                with m.If(self.init_delay_done):
                     m.next = "WAIT-GTP-RESET"
 
+                with m.If(reset_self):
+                    m.next = "POWER-DOWN"
+
             with m.State("WAIT-GTP-RESET"):
                 m.d.comb += txuserrdy.eq(1)
                 with m.If(txresetdone):
                     m.next = "READY"
 
+                with m.If(reset_self):
+                    m.next = "POWER-DOWN"
+
 
             with m.State("READY"):
                 m.d.comb += [
@@ -202,16 +401,21 @@ class GTPTXInit(Elaboratable):
                     txdlyen.eq(1),
                     self.done.eq(1),
                 ]
-                with m.If(self.restart):
+                with m.If(reset_self):
                     m.next = "POWER-DOWN"
 
+        # Only ask for the shared bringup timer to run while we're working towards (or
+        # waiting out) the post-configuration delay; this both lets the timer re-arm
+        # once all initialization FSMs are past it, and keeps its counter quiescent
+        # for the rest of operation.
+        m.d.comb += self.init_delay_wait.eq(
+            fsm.ongoing("POWER-DOWN")      |
+            fsm.ongoing("DRP")             |
+            fsm.ongoing("WAIT-PLL-RESET")  |
+            fsm.ongoing("WAIT-INIT-DELAY")
+        )
 
-        # FSM watchdog / restart
-        m.submodules.watchdog = watchdog = WaitTimer(int(1e-3*self._ss_clock_frequency))
-        reset_self = self.restart | watchdog.done
-        m.d.comb += watchdog.wait.eq(~reset_self & ~self.done),
-
-        return ResetInserter(reset_self)(m)
+        return m
 
 
 class GTPRXInit(Elaboratable):
@@ -224,6 +428,10 @@ class GTPRXInit(Elaboratable):
         self.done            = Signal()
         self.restart         = Signal()
 
+        # Post-configuration delay timer; shared with the other initialization FSMs.
+        self.init_delay_wait = Signal()
+        self.init_delay_done = Signal()
+
         # GTP signals
         self.plllock         = Signal()
         self.gtrxreset       = Signal()
@@ -257,7 +465,7 @@ class GTPRXInit(Elaboratable):
 
 
         rxpmaresetdone = Signal()
-        m.submodules += FFSynchronizer(self.rxpmaresetdone, rxpmaresetdone)
+        m.submodules += XilinxFFSynchronizer(self.rxpmaresetdone, rxpmaresetdone)
         rxpmaresetdone_r = Signal()
         m.d.ss += rxpmaresetdone_r.eq(rxpmaresetdone)
 
@@ -267,10 +475,10 @@ class GTPRXInit(Elaboratable):
         rxdlysresetdone = Signal()
         rxsyncdone      = Signal()
         m.submodules += [
-            FFSynchronizer(self.plllock, plllock, o_domain="ss"),
-            FFSynchronizer(self.rxresetdone, rxresetdone, o_domain="ss"),
-            FFSynchronizer(self.rxdlysresetdone, rxdlysresetdone, o_domain="ss"),
-            FFSynchronizer(self.rxsyncdone, rxsyncdone, o_domain="ss")
+            XilinxFFSynchronizer(self.plllock, plllock, o_domain="ss"),
+            XilinxFFSynchronizer(self.rxresetdone, rxresetdone, o_domain="ss"),
+            XilinxFFSynchronizer(self.rxdlysresetdone, rxdlysresetdone, o_domain="ss"),
+            XilinxFFSynchronizer(self.rxsyncdone, rxsyncdone, o_domain="ss")
         ]
 
         # Deglitch FSM outputs driving transceiver asynch inputs
@@ -287,13 +495,16 @@ class GTPRXInit(Elaboratable):
             self.rxuserrdy    .eq(rxuserrdy)
         ]
 
-        # Wait 500ns after configuration before releasing
-        # GTP reset (to follow AR43482)
-        init_delay = WaitTimer(int(500e-9*self._ss_clock_frequency))
-        m.submodules += init_delay
-        m.d.comb += init_delay.wait.eq(1)
+        # FSM watchdog / restart; prescaled, to keep the millisecond-range counter narrow.
+        # As above, we restart by steering the FSM back to POWER-DOWN explicitly rather
+        # than resetting the whole module, keeping the CDC synchronizers (and their
+        # placement constraints) outside the reset net.
+        m.submodules.watchdog = watchdog = \
+            WaitTimer(int(4e-3*self._ss_clock_frequency) // 1024, prescale=1024)
+        reset_self = watchdog.done | self.restart
+        m.d.comb += watchdog.wait.eq(~reset_self & ~self.done)
 
-        with m.FSM(domain="ss"):
+        with m.FSM(domain="ss") as fsm:
             with m.State("POWER-DOWN"):
                 m.d.comb += [
                     gtrxreset.eq(1),
@@ -301,11 +512,17 @@ class GTPRXInit(Elaboratable):
                 ]
                 m.next = "DRP_READ_ISSUE"
 
+                with m.If(reset_self):
+                    m.next = "POWER-DOWN"
+
             with m.State("DRP_READ_ISSUE"):
                 m.d.comb += gtrxreset.eq(1)
-                with m.If(init_delay.done):
+                with m.If(self.init_delay_done):
                     m.next = "DRP_READ_ISSUE_POST"
 
+                with m.If(reset_self):
+                    m.next = "POWER-DOWN"
+
             with m.State("DRP_READ_ISSUE_POST"):
                 m.d.comb += [
                     gtrxreset.eq(1),
@@ -313,12 +530,18 @@ class GTPRXInit(Elaboratable):
                 ]
                 m.next = "DRP_READ_WAIT"
 
+                with m.If(reset_self):
+                    m.next = "POWER-DOWN"
+
             with m.State("DRP_READ_WAIT"):
                 m.d.comb += gtrxreset.eq(1)
                 with m.If(self.drp.rdy):
                     m.d.ss += drpvalue.eq(self.drp.do)
                     m.next = "DRP_MOD_ISSUE"
 
+                with m.If(reset_self):
+                    m.next = "POWER-DOWN"
+
             with m.State("DRP_MOD_ISSUE"):
                 m.d.comb += [
                     gtrxreset.eq(1),
@@ -328,17 +551,26 @@ class GTPRXInit(Elaboratable):
                 ]
                 m.next = "DRP_MOD_WAIT"
 
+                with m.If(reset_self):
+                    m.next = "POWER-DOWN"
+
 
             with m.State("DRP_MOD_WAIT"):
                 m.d.comb += gtrxreset.eq(1)
                 with m.If(self.drp.rdy):
                     m.next = "WAIT_PMARST_FALL"
 
+                with m.If(reset_self):
+                    m.next = "POWER-DOWN"
+
             with m.State("WAIT_PMARST_FALL"):
                 m.d.comb += rxuserrdy.eq(1)
                 with m.If(rxpmaresetdone_r & ~rxpmaresetdone):
                     m.next = "DRP_RESTORE_ISSUE"
 
+                with m.If(reset_self):
+                    m.next = "POWER-DOWN"
+
 
             with m.State("DRP_RESTORE_ISSUE"):
                 m.d.comb += [
@@ -348,30 +580,41 @@ class GTPRXInit(Elaboratable):
                 ]
                 m.next = "DRP_RESTORE_WAIT"
 
+                with m.If(reset_self):
+                    m.next = "POWER-DOWN"
+
             with m.State("DRP_RESTORE_WAIT"):
                 m.d.comb += rxuserrdy.eq(1)
                 with m.If(self.drp.rdy):
 
                     m.next = "WAIT-GTP-RESET"
+
+                with m.If(reset_self):
+                    m.next = "POWER-DOWN"
             with m.State("WAIT-GTP-RESET"):
                 m.d.comb += rxuserrdy.eq(1)
                 with m.If(rxresetdone):
                     m.next = "READY"
 
+                with m.If(reset_self):
+                    m.next = "POWER-DOWN"
+
             with m.State("READY"):
                 m.d.comb += [
                     rxuserrdy.eq(1),
                     self.done.eq(1),
                 ]
-                with m.If(self.restart):
+                with m.If(reset_self):
                     m.next = "POWER-DOWN"
 
-        # FSM watchdog / restart
-        m.submodules.watchdog = watchdog = WaitTimer(int(4e-3*self._ss_clock_frequency))
-        reset_self = watchdog.done | self.restart
-        m.d.comb += watchdog.wait.eq(~reset_self & ~self.done),
+        # Only ask for the shared bringup timer to run while we're waiting out the
+        # post-configuration delay; see GTPTXInit for the rationale.
+        m.d.comb += self.init_delay_wait.eq(
+            fsm.ongoing("POWER-DOWN") |
+            fsm.ongoing("DRP_READ_ISSUE")
+        )
 
-        return ResetInserter(reset_self)(m)
+        return m
 
 
 
@@ -471,18 +714,39 @@ class GTPQuadPLL(Elaboratable):
 
     @staticmethod
     def compute_config(refclk_freq, linerate):
-        for n1 in 4, 5:
-            for n2 in 1, 2, 3, 4, 5:
-                for m in 1, 2:
+        # In multi-lane designs, several QPLL instances typically share identical parameters;
+        # memoize the search so each unique configuration is only computed once. We hand out
+        # a copy, so our cached result can't be mutated by the caller.
+        return dict(GTPQuadPLL._compute_config_cached(refclk_freq, linerate))
+
+
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def _compute_config_cached(refclk_freq, linerate):
+        # Rather than brute-forcing every (n1, n2, m, d) combination, solve the divider
+        # relation ``linerate = refclk_freq * (n1 * n2) * 2 / (m * d)`` directly: for each
+        # of the few legal output dividers, compute the feedback ratio we'd need, and check
+        # whether it factors into a legal (n1, n2) pair.
+        for d in 1, 2, 4, 8, 16:
+            for m in 1, 2:
+                # The total feedback division (n1 * n2) required for this choice of (m, d).
+                target = linerate * m * d / (2 * refclk_freq)
+                for n1 in 4, 5:
+                    n2 = round(target / n1)
+                    if not 1 <= n2 <= 5:
+                        continue
+
                     vco_freq = refclk_freq*(n1*n2)/m
-                    if 1.6e9 <= vco_freq <= 3.3e9:
-                        for d in 1, 2, 4, 8, 16:
-                            current_linerate = vco_freq*2/d
-                            if current_linerate == linerate:
-                                return {"n1": n1, "n2": n2, "m": m, "d": d,
-                                        "vco_freq": vco_freq,
-                                        "clkin": refclk_freq,
-                                        "linerate": linerate}
+                    if not 1.6e9 <= vco_freq <= 3.3e9:
+                        continue
+
+                    # Accept this candidate if it reproduces the requested linerate to within
+                    # 100ppm; exact float equality would silently miss non-round refclks.
+                    if math.isclose(vco_freq*2/d, linerate, rel_tol=100e-6):
+                        return {"n1": n1, "n2": n2, "m": m, "d": d,
+                                "vco_freq": vco_freq,
+                                "clkin": refclk_freq,
+                                "linerate": linerate}
         msg = "No config found for {:3.2f} MHz refclk / {:3.2f} Gbps linerate."
         raise ValueError(msg.format(refclk_freq/1e6, linerate/1e9))
 
@@ -525,7 +789,555 @@ CLKIN +----> /M  +-->       Charge Pump         +-> VCO +---> CLKOUT
         return r
 
 
+# The full GTPE2_CHANNEL descriptor, as (kind, name, value) port triples; built
+# once at import time rather than on every elaboration. Entries whose value is
+# None carry a design signal (or configuration-dependent constant), and are
+# overridden by GTP.elaborate; everything else is fixed.
+_GTP_PORTS = (
+    # Simulation-Only Attributes
+    ("p", "SIM_RECEIVER_DETECT_PASS", "TRUE"),
+    ("p", "SIM_TX_EIDLE_DRIVE_LEVEL", "X"),
+    ("p", "SIM_RESET_SPEEDUP",       "FALSE"),
+    ("p", "SIM_VERSION",             "2.0"),
+
+    # RX Byte and Word Alignment Attributes
+    ("p", "ALIGN_COMMA_DOUBLE",      "FALSE"),
+    ("p", "ALIGN_COMMA_ENABLE",      0b11_1111_1111),
+    #p_ALIGN_COMMA_WORD           = 2,
+    ("p", "ALIGN_COMMA_WORD",        1),
+    ("p", "ALIGN_MCOMMA_DET",        "TRUE"),
+    ("p", "ALIGN_MCOMMA_VALUE",      0b10_1000_0011),
+    ("p", "ALIGN_PCOMMA_DET",        "TRUE"),
+    ("p", "ALIGN_PCOMMA_VALUE",      0b01_0111_1100),
+    ("p", "SHOW_REALIGN_COMMA",      "TRUE"),
+    ("p", "RXSLIDE_AUTO_WAIT",       7),
+    ("p", "RXSLIDE_MODE",            "OFF"),
+    ("p", "RX_SIG_VALID_DLY",        10),
+
+    # RX 8B/10B Decoder Attributes
+    ("p", "RX_DISPERR_SEQ_MATCH",    "FALSE"),
+    ("p", "DEC_MCOMMA_DETECT",       "TRUE"),
+    ("p", "DEC_PCOMMA_DETECT",       "TRUE"),
+    ("p", "DEC_VALID_COMMA_ONLY",    "TRUE"),
+
+    # RX Clock Correction Attributes
+    ("p", "CBCC_DATA_SOURCE_SEL",    "DECODED"),
+    ("p", "CLK_COR_SEQ_2_USE",       "FALSE"),
+    ("p", "CLK_COR_KEEP_IDLE",       "FALSE"),
+    ("p", "CLK_COR_MAX_LAT",         10),
+    ("p", "CLK_COR_MIN_LAT",         8),
+    ("p", "CLK_COR_PRECEDENCE",      "TRUE"),
+    ("p", "CLK_COR_REPEAT_WAIT",     0),
+    ("p", "CLK_COR_SEQ_LEN",         2),
+    ("p", "CLK_COR_SEQ_1_ENABLE",    0b1100),
+    ("p", "CLK_COR_SEQ_1_1",         0b0000000000),
+    ("p", "CLK_COR_SEQ_1_2",         0b0000000000),
+    ("p", "CLK_COR_SEQ_1_3",         0b0000000000),
+    ("p", "CLK_COR_SEQ_1_4",         0b0000000000),
+    ("p", "CLK_CORRECT_USE",         "FALSE"),
+    ("p", "CLK_COR_SEQ_2_ENABLE",    0b1111),
+    ("p", "CLK_COR_SEQ_2_1",         0b0000000000),
+    ("p", "CLK_COR_SEQ_2_2",         0b0000000000),
+    ("p", "CLK_COR_SEQ_2_3",         0b0000000000),
+    ("p", "CLK_COR_SEQ_2_4",         0b0000000000),
+
+    # RX Channel Bonding Attributes
+    ("p", "CHAN_BOND_KEEP_ALIGN",    "FALSE"),
+    ("p", "CHAN_BOND_MAX_SKEW",      1),
+    ("p", "CHAN_BOND_SEQ_LEN",       1),
+    ("p", "CHAN_BOND_SEQ_1_1",       0b0000000000),
+    ("p", "CHAN_BOND_SEQ_1_2",       0b0000000000),
+    ("p", "CHAN_BOND_SEQ_1_3",       0b0000000000),
+    ("p", "CHAN_BOND_SEQ_1_4",       0b0000000000),
+    ("p", "CHAN_BOND_SEQ_1_ENABLE",  0b1111),
+    ("p", "CHAN_BOND_SEQ_2_1",       0b0000000000),
+    ("p", "CHAN_BOND_SEQ_2_2",       0b0000000000),
+    ("p", "CHAN_BOND_SEQ_2_3",       0b0000000000),
+    ("p", "CHAN_BOND_SEQ_2_4",       0b0000000000),
+    ("p", "CHAN_BOND_SEQ_2_ENABLE",  0b1111),
+    ("p", "CHAN_BOND_SEQ_2_USE",     "FALSE"),
+    ("p", "FTS_DESKEW_SEQ_ENABLE",   0b1111),
+    ("p", "FTS_LANE_DESKEW_CFG",     0b1111),
+    ("p", "FTS_LANE_DESKEW_EN",      "FALSE"),
+
+    # RX Margin Analysis Attributes
+    ("p", "ES_CONTROL",              0b000000),
+    ("p", "ES_ERRDET_EN",            "FALSE"),
+    ("p", "ES_EYE_SCAN_EN",          "TRUE"),
+    ("p", "ES_HORZ_OFFSET",          0x000),
+    ("p", "ES_PMA_CFG",              0b0000000000),
+    ("p", "ES_PRESCALE",             0b00000),
+    ("p", "ES_QUALIFIER",            0x00000000000000000000),
+    ("p", "ES_QUAL_MASK",            0x00000000000000000000),
+    ("p", "ES_SDATA_MASK",           0x00000000000000000000),
+    ("p", "ES_VERT_OFFSET",          0b000000000),
+
+    # PMA Attributes
+    ("p", "OUTREFCLK_SEL_INV",       0b11),
+    ("p", "PMA_RSV",                 0x00000333),
+    ("p", "PMA_RSV2",                0x00002040),
+    ("p", "PMA_RSV3",                0b00),
+    ("p", "PMA_RSV4",                0b0000),
+    ("p", "RX_BIAS_CFG",             0b0000111100110011),
+    ("p", "DMONITOR_CFG",            0x000A00),
+    ("p", "RX_DEBUG_CFG",            0b00000000000000),
+    ("p", "RX_OS_CFG",               0b0000010000000),
+    ("p", "TERM_RCAL_CFG",           0b100001000010000),
+    ("p", "TERM_RCAL_OVRD",          0b000),
+    ("p", "TST_RSV",                 0x00000000),
+    ("p", "RX_CLK25_DIV",            5),
+    ("p", "TX_CLK25_DIV",            5),
+    ("p", "UCODEER_CLR",             0b0),
+
+    # PCI Express Attributes
+    ("p", "PCS_PCIE_EN",             "FALSE"),
+
+    # PCS Attributes
+    ("p", "PCS_RSVD_ATTR",           0x000000000100),
+
+    # RX Buffer Attributes
+    ("p", "RXBUF_ADDR_MODE",         "FAST"),
+    ("p", "RXBUF_EIDLE_HI_CNT",      0b1000),
+    ("p", "RXBUF_EIDLE_LO_CNT",      0b0000),
+    ("p", "RXBUF_EN",                "TRUE"),
+    ("p", "RX_BUFFER_CFG",           0b000000),
+    ("p", "RXBUF_RESET_ON_CB_CHANGE", "TRUE"),
+    ("p", "RXBUF_RESET_ON_COMMAALIGN", "FALSE"),
+    ("p", "RXBUF_RESET_ON_EIDLE",    "FALSE"),
+    ("p", "RXBUF_RESET_ON_RATE_CHANGE", "TRUE"),
+    ("p", "RXBUFRESET_TIME",         0b00001),
+    ("p", "RXBUF_THRESH_OVFLW",      61),
+    ("p", "RXBUF_THRESH_OVRD",       "FALSE"),
+    ("p", "RXBUF_THRESH_UNDFLW",     4),
+    ("p", "RXDLY_CFG",               0x001F),
+    ("p", "RXDLY_LCFG",              0x030),
+    ("p", "RXDLY_TAP_CFG",           0x0000),
+    ("p", "RXPH_CFG",                0xC00002),
+    ("p", "RXPHDLY_CFG",             0x084020),
+    ("p", "RXPH_MONITOR_SEL",        0b00000),
+    ("p", "RX_XCLK_SEL",             "RXREC"),
+    ("p", "RX_DDI_SEL",              0b000000),
+    ("p", "RX_DEFER_RESET_BUF_EN",   "TRUE"),
+
+    # CDR Attributes
+    ("p", "RXCDR_FR_RESET_ON_EIDLE", 0b0),
+    ("p", "RXCDR_HOLD_DURING_EIDLE", 0b0),
+    ("p", "RXCDR_PH_RESET_ON_EIDLE", 0b0),
+    ("p", "RXCDR_LOCK_CFG",          0b001001),
+
+    # RX Initialization and Reset Attributes
+    ("p", "RXCDRFREQRESET_TIME",     0b00001),
+    ("p", "RXCDRPHRESET_TIME",       0b00001),
+    ("p", "RXISCANRESET_TIME",       0b00001),
+    ("p", "RXPCSRESET_TIME",         0b00001),
+    ("p", "RXPMARESET_TIME",         0b00011),
+
+    # RX OOB Signaling Attributes
+    ("p", "RXOOB_CFG",               0b0000110),
+
+    # RX Gearbox Attributes
+    ("p", "RXGEARBOX_EN",            "FALSE"),
+    ("p", "GEARBOX_MODE",            0b000),
+
+    # PRBS Detection Attribute
+    ("p", "RXPRBS_ERR_LOOPBACK",     0b0),
+
+    # Power-Down Attributes
+    ("p", "PD_TRANS_TIME_FROM_P2",   0x03c),
+    ("p", "PD_TRANS_TIME_NONE_P2",   0x3c),
+    ("p", "PD_TRANS_TIME_TO_P2",     0x64),
+
+    # RX OOB Signaling Attributes
+    ("p", "SAS_MAX_COM",             64),
+    ("p", "SAS_MIN_COM",             36),
+    ("p", "SATA_BURST_SEQ_LEN",      0b0101),
+    ("p", "SATA_BURST_VAL",          0b100),
+    ("p", "SATA_EIDLE_VAL",          0b100),
+    ("p", "SATA_MAX_BURST",          8),
+    ("p", "SATA_MAX_INIT",           21),
+    ("p", "SATA_MAX_WAKE",           7),
+    ("p", "SATA_MIN_BURST",          4),
+    ("p", "SATA_MIN_INIT",           12),
+    ("p", "SATA_MIN_WAKE",           4),
+
+    # RX Fabric Clock Output Control Attributes
+    ("p", "TRANS_TIME_RATE",         0x0E),
+
+    # TX Buffer Attributes
+    ("p", "TXBUF_EN",                "TRUE"),
+    ("p", "TXBUF_RESET_ON_RATE_CHANGE", "TRUE"),
+    ("p", "TXDLY_CFG",               0x001F),
+    ("p", "TXDLY_LCFG",              0x030),
+    ("p", "TXDLY_TAP_CFG",           0x0000),
+    ("p", "TXPH_CFG",                0x0780),
+    ("p", "TXPHDLY_CFG",             0x084020),
+    ("p", "TXPH_MONITOR_SEL",        0b00000),
+    ("p", "TX_XCLK_SEL",             "TXOUT"),
+
+    # TX Configurable Driver Attributes
+    ("p", "TX_DEEMPH0",              0b000000),
+    ("p", "TX_DEEMPH1",              0b000000),
+    ("p", "TX_EIDLE_ASSERT_DELAY",   0b110),
+    ("p", "TX_EIDLE_DEASSERT_DELAY", 0b100),
+    ("p", "TX_LOOPBACK_DRIVE_HIZ",   "FALSE"),
+    ("p", "TX_MAINCURSOR_SEL",       0b0),
+    ("p", "TX_DRIVE_MODE",           "DIRECT"),
+    ("p", "TX_MARGIN_FULL_0",        0b1001110),
+    ("p", "TX_MARGIN_FULL_1",        0b1001001),
+    ("p", "TX_MARGIN_FULL_2",        0b1000101),
+    ("p", "TX_MARGIN_FULL_3",        0b1000010),
+    ("p", "TX_MARGIN_FULL_4",        0b1000000),
+    ("p", "TX_MARGIN_LOW_0",         0b1000110),
+    ("p", "TX_MARGIN_LOW_1",         0b1000100),
+    ("p", "TX_MARGIN_LOW_2",         0b1000010),
+    ("p", "TX_MARGIN_LOW_3",         0b1000000),
+    ("p", "TX_MARGIN_LOW_4",         0b1000000),
+
+    # TX Gearbox Attributes
+    ("p", "TXGEARBOX_EN",            "FALSE"),
+
+    # TX Initialization and Reset Attributes
+    ("p", "TXPCSRESET_TIME",         0b00001),
+    ("p", "TXPMARESET_TIME",         0b00001),
+
+    # TX Receiver Detection Attributes
+    ("p", "TX_RXDETECT_CFG",         0x1832),
+    ("p", "TX_RXDETECT_REF",         0b100),
+
+    # JTAG Attributes
+    ("p", "ACJTAG_DEBUG_MODE",       0b0),
+    ("p", "ACJTAG_MODE",             0b0),
+    ("p", "ACJTAG_RESET",            0b0),
+
+    # CDR Attributes
+    ("p", "CFOK_CFG",                0x49000040E80),
+    ("p", "CFOK_CFG2",               0b0100000),
+    ("p", "CFOK_CFG3",               0b0100000),
+    ("p", "CFOK_CFG4",               0b0),
+    ("p", "CFOK_CFG5",               0x0),
+    ("p", "CFOK_CFG6",               0b0000),
+    ("p", "RXOSCALRESET_TIME",       0b00011),
+    ("p", "RXOSCALRESET_TIMEOUT",    0b00000),
+
+    # PMA Attributes
+    ("p", "CLK_COMMON_SWING",        0b0),
+    ("p", "RX_CLKMUX_EN",            0b1),
+    ("p", "TX_CLKMUX_EN",            0b1),
+    ("p", "ES_CLK_PHASE_SEL",        0b0),
+    ("p", "USE_PCS_CLK_PHASE_SEL",   0b0),
+    ("p", "PMA_RSV6",                0b0),
+    ("p", "PMA_RSV7",                0b0),
+
+    # TX Configuration Driver Attributes
+    ("p", "TX_PREDRIVER_MODE",       0b0),
+    ("p", "PMA_RSV5",                0b0),
+    ("p", "SATA_PLL_CFG",            "VCO_3000MHZ"),
+
+    # RX Phase Interpolator Attributes
+    ("p", "RXPI_CFG0",               0b000),
+    ("p", "RXPI_CFG1",               0b1),
+    ("p", "RXPI_CFG2",               0b1),
+
+    # RX Equalizer Attributes
+    ("p", "ADAPT_CFG0",              0x00000),
+    ("p", "RXLPMRESET_TIME",         0b0001111),
+    ("p", "RXLPM_BIAS_STARTUP_DISABLE", 0b0),
+    ("p", "RXLPM_CFG",               0b0110),
+    ("p", "RXLPM_CFG1",              0b0),
+    ("p", "RXLPM_CM_CFG",            0b0),
+    ("p", "RXLPM_GC_CFG",            0b111100010),
+    ("p", "RXLPM_GC_CFG2",           0b001),
+    ("p", "RXLPM_HF_CFG",            0b00001111110000),
+    ("p", "RXLPM_HF_CFG2",           0b01010),
+    ("p", "RXLPM_HF_CFG3",           0b0000),
+    ("p", "RXLPM_HOLD_DURING_EIDLE", 0b0),
+    ("p", "RXLPM_INCM_CFG",          0b1),
+    ("p", "RXLPM_IPCM_CFG",          0b0),
+    ("p", "RXLPM_LF_CFG",            0b000000001111110000),
+    ("p", "RXLPM_LF_CFG2",           0b01010),
+    ("p", "RXLPM_OSINT_CFG",         0b100),
+
+    # TX Phase Interpolator PPM Controller Attributes
+    ("p", "TXPI_CFG0",               0b00),
+    ("p", "TXPI_CFG1",               0b00),
+    ("p", "TXPI_CFG2",               0b00),
+    ("p", "TXPI_CFG3",               0b0),
+    ("p", "TXPI_CFG4",               0b0),
+    ("p", "TXPI_CFG5",               0b000),
+    ("p", "TXPI_GREY_SEL",           0b0),
+    ("p", "TXPI_INVSTROBE_SEL",      0b0),
+    ("p", "TXPI_PPMCLK_SEL",         "TXUSRCLK2"),
+    ("p", "TXPI_PPM_CFG",            0x00),
+    ("p", "TXPI_SYNFREQ_PPM",        0b001),
+
+    # LOOPBACK Attributes
+    ("p", "LOOPBACK_CFG",            0b0),
+    ("p", "PMA_LOOPBACK_CFG",        0b0),
+
+    ("p", "RX_CM_SEL",               0b11),
+    ("p", "RX_CM_TRIM",              0b1010),
+
+    # RX OOB Signalling Attributes
+    ("p", "RXOOB_CLK_CFG",           "FABRIC"),
+
+    # TX OOB Signalling Attributes
+    ("p", "TXOOB_CFG",               0b0),
+
+    # RX Buffer Attributes
+    ("p", "RXSYNC_MULTILANE",        0b0),
+    ("p", "RXSYNC_OVRD",             0b0),
+    ("p", "RXSYNC_SKIP_DA",          0b0),
+
+    # TX Buffer Attributes
+    ("p", "TXSYNC_MULTILANE",        0b0),
+    ("p", "TXSYNC_OVRD",             0b1),
+    ("p", "TXSYNC_SKIP_DA",          0b0),
+
+    # Constant input ports (tied off or fixed by our configuration).
+    ("i", "GTRSVD",                  0b0000000000000000),
+    ("i", "PCSRSVDIN",               0b0000000000000000),
+    ("i", "TSTIN",                   0b11111111111111111111),
+    ("i", "RXRATE",                  0),
+    ("i", "PMARSVDIN3",              0b0),
+    ("i", "PMARSVDIN4",              0b0),
+    ("i", "TXPD",                    0b00),
+    ("i", "SETERRSTATUS",            0),
+    ("i", "EYESCANRESET",            0),
+    ("i", "EYESCANMODE",             0),
+    ("i", "EYESCANTRIGGER",          0),
+    ("i", "CLKRSVD0",                0),
+    ("i", "CLKRSVD1",                0),
+    ("i", "DMONFIFORESET",           0),
+    ("i", "DMONITORCLK",             0),
+    ("i", "RXCDRFREQRESET",          0),
+    ("i", "RXCDRHOLD",               0),
+    ("i", "RXCDROVRDEN",             0),
+    ("i", "RXCDRRESET",              0),
+    ("i", "RXCDRRESETRSV",           0),
+    ("i", "RXOSCALRESET",            0),
+    ("i", "RXOSINTCFG",              0b0010),
+    ("i", "RXOSINTHOLD",             0),
+    ("i", "RXOSINTOVRDEN",           0),
+    ("i", "RXOSINTPD",               0),
+    ("i", "RXOSINTSTROBE",           0),
+    ("i", "RXOSINTTESTOVRDEN",       0),
+    ("i", "RX8B10BEN",               1),
+    ("i", "RXPRBSSEL",               0),
+    ("i", "RXPRBSCNTRESET",          0),
+    ("i", "PMARSVDIN2",              0b0),
+    ("i", "RXBUFRESET",              0),
+    ("i", "RXDDIEN",                 0),
+    ("i", "RXDLYBYPASS",             1),
+    ("i", "RXDLYEN",                 0),
+    ("i", "RXDLYOVRDEN",             0),
+    ("i", "RXPHALIGN",               0),
+    ("i", "RXPHALIGNEN",             0),
+    ("i", "RXPHDLYPD",               0),
+    ("i", "RXPHDLYRESET",            0),
+    ("i", "RXPHOVRDEN",              0),
+    ("i", "RXSYNCIN",                0),
+    ("i", "RXSYNCMODE",              0),
+    ("i", "RXCOMMADETEN",            1),
+    ("i", "RXSLIDE",                 0),
+    ("i", "RXCHBONDEN",              0),
+    ("i", "RXCHBONDI",               0b0000),
+    ("i", "RXCHBONDLEVEL",           0),
+    ("i", "RXCHBONDMASTER",          0),
+    ("i", "RXCHBONDSLAVE",           0),
+    ("i", "RXADAPTSELTEST",          0),
+    ("i", "RXDFEXYDEN",              0),
+    ("i", "RXOSINTEN",               0b1),
+    ("i", "RXOSINTID0",              0),
+    ("i", "RXOSINTNTRLEN",           0),
+    ("i", "RXLPMLFOVRDEN",           0),
+    ("i", "RXLPMOSINTNTRLEN",        0),
+    ("i", "RXLPMHFOVRDEN",           0),
+    ("i", "RXOSHOLD",                0),
+    ("i", "RXOSOVRDEN",              0),
+    ("i", "RXRATEMODE",              0b0),
+    ("i", "RXOUTCLKSEL",             0b010),
+    ("i", "RXGEARBOXSLIP",           0),
+    ("i", "RXLPMRESET",              0),
+    ("i", "RXOOBRESET",              0),
+    ("i", "RXPCSRESET",              0),
+    ("i", "RXPMARESET",              0),
+    ("i", "RXELECIDLEMODE",          0b00),
+    ("i", "TXPHDLYTSTCLK",           0),
+    ("i", "TXPOSTCURSOR",            0b00000),
+    ("i", "TXPOSTCURSORINV",         0),
+    ("i", "TXPRECURSOR",             0b00000),
+    ("i", "TXPRECURSORINV",          0),
+    ("i", "TXRATEMODE",              0),
+    ("i", "CFGRESET",                0),
+    ("i", "TXPIPPMEN",               0),
+    ("i", "TXPIPPMOVRDEN",           0),
+    ("i", "TXPIPPMPD",               0),
+    ("i", "TXPIPPMSEL",              1),
+    ("i", "TXPIPPMSTEPSIZE",         0),
+    ("i", "GTRESETSEL",              0),
+    ("i", "RESETOVRD",               0),
+    ("i", "PMARSVDIN0",              0b0),
+    ("i", "PMARSVDIN1",              0b0),
+    ("i", "TXMARGIN",                0),
+    ("i", "TXRATE",                  0),
+    ("i", "TXSWING",                 0),
+    ("i", "TXPRBSFORCEERR",          0),
+    ("i", "TX8B10BBYPASS",           0),
+    ("i", "TXDLYBYPASS",             1),
+    ("i", "TXDLYHOLD",               0),
+    ("i", "TXDLYOVRDEN",             0),
+    ("i", "TXDLYUPDOWN",             0),
+    ("i", "TXPHALIGNEN",             0),
+    ("i", "TXPHDLYPD",               0),
+    ("i", "TXPHDLYRESET",            0),
+    ("i", "TXPHOVRDEN",              0),
+    ("i", "TXSYNCALLIN",             0),
+    ("i", "TXSYNCIN",                0),
+    ("i", "TXSYNCMODE",              0),
+    ("i", "TXBUFDIFFCTRL",           0b100),
+    ("i", "TXDEEMPH",                0),
+    ("i", "TXDIFFCTRL",              0b1000),
+    ("i", "TXDIFFPD",                0),
+    ("i", "TXMAINCURSOR",            0b0000000),
+    ("i", "TXPISOPD",                0),
+    ("i", "TXOUTCLKSEL",             0b010),
+    ("i", "TXHEADER",                0),
+    ("i", "TXSEQUENCE",              0),
+    ("i", "TXSTARTSEQ",              0),
+    ("i", "TXPCSRESET",              0),
+    ("i", "TXPMARESET",              0),
+    ("i", "TXCOMINIT",               0),
+    ("i", "TXCOMSAS",                0),
+    ("i", "TXCOMWAKE",               0),
+    ("i", "TXPDELECIDLEMODE",        0),
+    ("i", "TXDETECTRX",              0),
+    ("i", "TXPRBSSEL",               0),
+
+    # Signal-bearing and configuration-dependent ports; values supplied at elaboration.
+    ("p", "RX_DATA_WIDTH",           None),
+    ("p", "TX_DATA_WIDTH",           None),
+    ("p", "RXCDR_CFG",               None),
+    ("p", "RXOUT_DIV",               None),
+    ("p", "TXOUT_DIV",               None),
+    ("i", "DRPADDR",                 None),
+    ("i", "DRPCLK",                  None),
+    ("i", "DRPDI",                   None),
+    ("o", "DRPDO",                   None),
+    ("i", "DRPEN",                   None),
+    ("o", "DRPRDY",                  None),
+    ("i", "DRPWE",                   None),
+    ("i", "RXSYSCLKSEL",             None),
+    ("i", "TXSYSCLKSEL",             None),
+    ("i", "TX8B10BEN",               None),
+    ("i", "PLL0CLK",                 None),
+    ("i", "PLL0REFCLK",              None),
+    ("i", "PLL1CLK",                 None),
+    ("i", "PLL1REFCLK",              None),
+    ("i", "LOOPBACK",                None),
+    ("i", "RXPD",                    None),
+    ("i", "RXUSERRDY",               None),
+    ("o", "RXPMARESETDONE",          None),
+    ("i", "SIGVALIDCLK",             None),
+    ("o", "RXDATA",                  None),
+    ("i", "RXUSRCLK",                None),
+    ("i", "RXUSRCLK2",               None),
+    ("o", "RXCHARISK",               None),
+    ("o", "RXDISPERR",               None),
+    ("o", "RXNOTINTABLE",            None),
+    ("i", "GTPRXN",                  None),
+    ("i", "GTPRXP",                  None),
+    ("i", "RXDLYSRESET",             None),
+    ("o", "RXDLYSRESETDONE",         None),
+    ("o", "RXPHALIGNDONE",           None),
+    ("i", "RXSYNCALLIN",             None),
+    ("o", "RXSYNCDONE",              None),
+    ("i", "RXMCOMMAALIGNEN",         None),
+    ("i", "RXPCOMMAALIGNEN",         None),
+    ("i", "RXLPMHFHOLD",             None),
+    ("i", "RXLPMLFHOLD",             None),
+    ("o", "RXOUTCLK",                None),
+    ("i", "GTRXRESET",               None),
+    ("o", "RXELECIDLE",              None),
+    ("i", "RXPOLARITY",              None),
+    ("o", "RXRESETDONE",             None),
+    ("i", "GTTXRESET",               None),
+    ("i", "TXUSERRDY",               None),
+    ("i", "TXDATA",                  None),
+    ("i", "TXUSRCLK",                None),
+    ("i", "TXUSRCLK2",               None),
+    ("i", "TXELECIDLE",              None),
+    ("i", "TXCHARDISPMODE",          None),
+    ("i", "TXCHARDISPVAL",           None),
+    ("i", "TXCHARISK",               None),
+    ("i", "TXDLYEN",                 None),
+    ("i", "TXDLYSRESET",             None),
+    ("o", "TXDLYSRESETDONE",         None),
+    ("i", "TXPHALIGN",               None),
+    ("o", "TXPHALIGNDONE",           None),
+    ("i", "TXPHINIT",                None),
+    ("o", "TXPHINITDONE",            None),
+    ("o", "GTPTXN",                  None),
+    ("o", "GTPTXP",                  None),
+    ("i", "TXINHIBIT",               None),
+    ("o", "TXOUTCLK",                None),
+    ("o", "TXRESETDONE",             None),
+    ("i", "TXPOLARITY",              None),
+)
+
+# Partially evaluate the table above at import time: the static entries never
+# change between elaborations, so resolve them here once, leaving elaborate()
+# to fill in only the signal-bearing and configuration-dependent remainder.
+# Constant tie-off inputs share one Const per distinct value -- most notably
+# the ~90 zero tie-offs -- rather than each allocating its own per lane; Consts
+# are immutable, so every lane's Instance can reuse them. (The tools extend
+# each tie-off to the primitive's port width, exactly as for a bare literal.)
+# Parameters keep their literal values.
+@functools.lru_cache(maxsize=None)
+def _tie_off(value):
+    return Const(value)
+
+_GTP_STATIC_PORTS  = tuple(
+    (kind, name, _tie_off(value)) if kind == "i" else (kind, name, value)
+    for kind, name, value in _GTP_PORTS if value is not None)
+_GTP_DYNAMIC_PORTS = tuple((kind, name) for kind, name, value in _GTP_PORTS if value is None)
+
+
+
+def _add_output_clock_domain(m, name, source_clock, reset):
+    """ Adds a clock domain `name` clocked by `source_clock` through a BUFG, with
+    `reset` synchronized into it. """
+    m.domains += ClockDomain(name)
+    m.submodules += [
+        Instance("BUFG", i_I=source_clock, o_O=ClockSignal(name)),
+        ResetSynchronizer(reset, domain=name)
+    ]
+
+
 class GTP(Elaboratable):
+
+    # Wait 500ns after configuration before releasing GTP resets (to follow AR43482).
+    _INIT_DELAY = 500e-9
+
+    # Whether to expose the GTP's status/debug outputs as Open() ports. Off by
+    # default: unconnected outputs are legal on Xilinx primitives, and each
+    # Open() costs us a signal allocation per lane.
+    INCLUDE_DEBUG_PORTS = False
+
+    # The status/debug outputs in question; only generated when the above is set.
+    _DEBUG_OUTPUT_PORTS = (
+        "PHYSTATUS", "RXVALID", "EYESCANDATAERROR", "RXCDRLOCK",
+        "RXOSINTDONE", "RXOSINTSTARTED", "RXOSINTSTROBESTARTED", "RXCLKCORCNT",
+        "RXPRBSERR", "RXCHARISCOMMA", "PMARSVDOUT0", "PMARSVDOUT1",
+        "RXBUFSTATUS", "RXPHMONITOR", "RXPHSLIPMONITOR", "RXSTATUS",
+        "RXSYNCOUT", "RXBYTEISALIGNED", "RXBYTEREALIGN", "RXCOMMADET",
+        "RXCHANBONDSEQ", "RXCHBONDO", "RXCHANISALIGNED", "RXCHANREALIGN",
+        "DMONITOROUT", "RXOSINTSTROBEDONE", "RXRATEDONE", "RXOUTCLKFABRIC",
+        "RXOUTCLKPCS", "RXDATAVALID", "RXHEADER", "RXHEADERVALID",
+        "RXSTARTOFSEQ", "RXCOMSASDET", "RXCOMWAKEDET", "RXCOMINITDET",
+        "TXBUFSTATUS", "TXSYNCDONE", "TXSYNCOUT", "TXOUTCLKFABRIC",
+        "TXOUTCLKPCS", "TXRATEDONE", "TXGEARBOXREADY", "TXCOMFINISH",
+    )
+
     def __init__(self, qpll, tx_pads, rx_pads, ss_clock_frequency):
         self._qpll    = qpll
         self._tx_pads = tx_pads
@@ -576,8 +1388,11 @@ class GTP(Elaboratable):
         data_width = self.data_width
         nwords     = self.nwords
 
-        # Ensure we have a valid PLL/CDR configuration.
-        assert qpll.config["linerate"] < 6.6e9
+        # Ensure we have a valid PLL/CDR configuration. The configuration itself is
+        # computed once at QPLL construction; we just avoid re-indexing it below.
+        qpll_config = qpll.config
+        out_div     = qpll_config["d"]
+        assert qpll_config["linerate"] < 6.6e9
         rxcdr_cfgs = {
             1 : 0x0000107FE406001041010,
             2 : 0x0000107FE206001041010,
@@ -599,13 +1414,22 @@ class GTP(Elaboratable):
 
 
 
+        #
+        # Bringup delay.
+        #
+        # Both of our initialization FSMs wait out the same post-configuration delay
+        # before releasing their GTP resets; share a single timer between the two.
+        m.submodules.init_delay = init_delay = \
+            WaitTimer(int(self._INIT_DELAY * self._ss_clock_frequency))
+
         #
         # Transmitter bringup.
         #
         m.submodules.tx_init = tx_init = GTPTXInit(self._ss_clock_frequency)
         m.d.comb += [
-            self.tx_ready    .eq(tx_init.done),
-            tx_init.restart  .eq(~self.tx_enable)
+            self.tx_ready             .eq(tx_init.done),
+            tx_init.restart           .eq(~self.tx_enable),
+            tx_init.init_delay_done   .eq(init_delay.done)
         ]
 
         #
@@ -613,10 +1437,14 @@ class GTP(Elaboratable):
         #
         m.submodules.rx_init = rx_init = GTPRXInit(self._ss_clock_frequency)
         m.d.comb += [
-            self.rx_ready.eq(rx_init.done),
-            rx_init.restart.eq(~self.rx_enable)
+            self.rx_ready             .eq(rx_init.done),
+            rx_init.restart           .eq(~self.rx_enable),
+            rx_init.init_delay_done   .eq(init_delay.done)
         ]
 
+        # Run the shared timer whenever either initialization FSM is waiting on it.
+        m.d.comb += init_delay.wait.eq(tx_init.init_delay_wait | rx_init.init_delay_wait)
+
         #
         # PLL interconnection
         #
@@ -626,6 +1454,21 @@ class GTP(Elaboratable):
             qpll.reset.eq(tx_init.pllreset)
         ]
 
+        #
+        # DRP clock domain
+        #
+        # Our initialization FSMs handshake with any external DRP sequencer through the
+        # "drp" domain. We have no dedicated DRP clock, so run the domain from our ss
+        # clock; and as no TX-side sequencer is attached, acknowledge TX requests
+        # immediately by looping the request pulse back.
+        m.domains.drp = ClockDomain()
+        m.d.comb += [
+            ClockSignal("drp")  .eq(ClockSignal("ss")),
+            ResetSignal("drp")  .eq(ResetSignal("ss")),
+
+            tx_init.drp_done    .eq(tx_init.drp_start)
+        ]
+
         #
         # DRP
         #
@@ -663,664 +1506,156 @@ class GTP(Elaboratable):
         rx_code_error = Signal(nwords)
 
 
-        m.submodules.gtp = Instance("GTPE2_CHANNEL",
-            # Simulation-Only Attributes
-            p_SIM_RECEIVER_DETECT_PASS   = "TRUE",
-            p_SIM_TX_EIDLE_DRIVE_LEVEL   = "X",
-            p_SIM_RESET_SPEEDUP          = "FALSE",
-            p_SIM_VERSION                = "2.0",
-
-            # RX Byte and Word Alignment Attributes
-            p_ALIGN_COMMA_DOUBLE         = "FALSE",
-            p_ALIGN_COMMA_ENABLE         = 0b11_1111_1111,
-            #p_ALIGN_COMMA_WORD           = 2,
-            p_ALIGN_COMMA_WORD           = 1,
-            p_ALIGN_MCOMMA_DET           = "TRUE",
-            p_ALIGN_MCOMMA_VALUE         = 0b10_1000_0011,
-            p_ALIGN_PCOMMA_DET           = "TRUE",
-            p_ALIGN_PCOMMA_VALUE         = 0b01_0111_1100,
-            p_SHOW_REALIGN_COMMA         = "TRUE",
-            p_RXSLIDE_AUTO_WAIT          = 7,
-            p_RXSLIDE_MODE               = "OFF",
-            p_RX_SIG_VALID_DLY           = 10,
-
-            # RX 8B/10B Decoder Attributes
-            p_RX_DISPERR_SEQ_MATCH       = "FALSE",
-            p_DEC_MCOMMA_DETECT          = "TRUE",
-            p_DEC_PCOMMA_DETECT          = "TRUE",
-            p_DEC_VALID_COMMA_ONLY       = "TRUE",
-
-            # RX Clock Correction Attributes
-            p_CBCC_DATA_SOURCE_SEL       = "DECODED",
-            p_CLK_COR_SEQ_2_USE          = "FALSE",
-            p_CLK_COR_KEEP_IDLE          = "FALSE",
-            p_CLK_COR_MAX_LAT            = 10,
-            p_CLK_COR_MIN_LAT            = 8,
-            p_CLK_COR_PRECEDENCE         = "TRUE",
-            p_CLK_COR_REPEAT_WAIT        = 0,
-            p_CLK_COR_SEQ_LEN            = 2,
-            p_CLK_COR_SEQ_1_ENABLE       = 0b1100,
-            p_CLK_COR_SEQ_1_1            = 0b0000000000,
-            p_CLK_COR_SEQ_1_2            = 0b0000000000,
-            p_CLK_COR_SEQ_1_3            = 0b0000000000,
-            p_CLK_COR_SEQ_1_4            = 0b0000000000,
-            p_CLK_CORRECT_USE            = "FALSE",
-            p_CLK_COR_SEQ_2_ENABLE       = 0b1111,
-            p_CLK_COR_SEQ_2_1            = 0b0000000000,
-            p_CLK_COR_SEQ_2_2            = 0b0000000000,
-            p_CLK_COR_SEQ_2_3            = 0b0000000000,
-            p_CLK_COR_SEQ_2_4            = 0b0000000000,
-
-            # RX Channel Bonding Attributes
-            p_CHAN_BOND_KEEP_ALIGN       = "FALSE",
-            p_CHAN_BOND_MAX_SKEW         = 1,
-            p_CHAN_BOND_SEQ_LEN          = 1,
-            p_CHAN_BOND_SEQ_1_1          = 0b0000000000,
-            p_CHAN_BOND_SEQ_1_2          = 0b0000000000,
-            p_CHAN_BOND_SEQ_1_3          = 0b0000000000,
-            p_CHAN_BOND_SEQ_1_4          = 0b0000000000,
-            p_CHAN_BOND_SEQ_1_ENABLE     = 0b1111,
-            p_CHAN_BOND_SEQ_2_1          = 0b0000000000,
-            p_CHAN_BOND_SEQ_2_2          = 0b0000000000,
-            p_CHAN_BOND_SEQ_2_3          = 0b0000000000,
-            p_CHAN_BOND_SEQ_2_4          = 0b0000000000,
-            p_CHAN_BOND_SEQ_2_ENABLE     = 0b1111,
-            p_CHAN_BOND_SEQ_2_USE        = "FALSE",
-            p_FTS_DESKEW_SEQ_ENABLE      = 0b1111,
-            p_FTS_LANE_DESKEW_CFG        = 0b1111,
-            p_FTS_LANE_DESKEW_EN         = "FALSE",
-
-            # RX Margin Analysis Attributes
-            p_ES_CONTROL                 = 0b000000,
-            p_ES_ERRDET_EN               = "FALSE",
-            p_ES_EYE_SCAN_EN             = "TRUE",
-            p_ES_HORZ_OFFSET             = 0x000,
-            p_ES_PMA_CFG                 = 0b0000000000,
-            p_ES_PRESCALE                = 0b00000,
-            p_ES_QUALIFIER               = 0x00000000000000000000,
-            p_ES_QUAL_MASK               = 0x00000000000000000000,
-            p_ES_SDATA_MASK              = 0x00000000000000000000,
-            p_ES_VERT_OFFSET             = 0b000000000,
-
-            # FPGA RX Interface Attributes
-            p_RX_DATA_WIDTH              = data_width,
-
-            # PMA Attributes
-            p_OUTREFCLK_SEL_INV          = 0b11,
-            p_PMA_RSV                    = 0x00000333,
-            p_PMA_RSV2                   = 0x00002040,
-            p_PMA_RSV3                   = 0b00,
-            p_PMA_RSV4                   = 0b0000,
-            p_RX_BIAS_CFG                = 0b0000111100110011,
-            p_DMONITOR_CFG               = 0x000A00,
-            p_RX_DEBUG_CFG               = 0b00000000000000,
-            p_RX_OS_CFG                  = 0b0000010000000,
-            p_TERM_RCAL_CFG              = 0b100001000010000,
-            p_TERM_RCAL_OVRD             = 0b000,
-            p_TST_RSV                    = 0x00000000,
-            p_RX_CLK25_DIV               = 5,
-            p_TX_CLK25_DIV               = 5,
-            p_UCODEER_CLR                = 0b0,
-
-            # PCI Express Attributes
-            p_PCS_PCIE_EN                = "FALSE",
-
-            # PCS Attributes
-            p_PCS_RSVD_ATTR              = 0x000000000100,
-
-            # RX Buffer Attributes
-            p_RXBUF_ADDR_MODE            = "FAST",
-            p_RXBUF_EIDLE_HI_CNT         = 0b1000,
-            p_RXBUF_EIDLE_LO_CNT         = 0b0000,
-            p_RXBUF_EN                   = "TRUE",
-            p_RX_BUFFER_CFG              = 0b000000,
-            p_RXBUF_RESET_ON_CB_CHANGE   = "TRUE",
-            p_RXBUF_RESET_ON_COMMAALIGN  = "FALSE",
-            p_RXBUF_RESET_ON_EIDLE       = "FALSE",
-            p_RXBUF_RESET_ON_RATE_CHANGE = "TRUE",
-            p_RXBUFRESET_TIME            = 0b00001,
-            p_RXBUF_THRESH_OVFLW         = 61,
-            p_RXBUF_THRESH_OVRD          = "FALSE",
-            p_RXBUF_THRESH_UNDFLW        = 4,
-            p_RXDLY_CFG                  = 0x001F,
-            p_RXDLY_LCFG                 = 0x030,
-            p_RXDLY_TAP_CFG              = 0x0000,
-            p_RXPH_CFG                   = 0xC00002,
-            p_RXPHDLY_CFG                = 0x084020,
-            p_RXPH_MONITOR_SEL           = 0b00000,
-            p_RX_XCLK_SEL                = "RXREC",
-            p_RX_DDI_SEL                 = 0b000000,
-            p_RX_DEFER_RESET_BUF_EN      = "TRUE",
-
-            # CDR Attributes
-            p_RXCDR_CFG                  = rxcdr_cfgs[qpll.config["d"]],
-            p_RXCDR_FR_RESET_ON_EIDLE    = 0b0,
-            p_RXCDR_HOLD_DURING_EIDLE    = 0b0,
-            p_RXCDR_PH_RESET_ON_EIDLE    = 0b0,
-            p_RXCDR_LOCK_CFG             = 0b001001,
-
-            # RX Initialization and Reset Attributes
-            p_RXCDRFREQRESET_TIME        = 0b00001,
-            p_RXCDRPHRESET_TIME          = 0b00001,
-            p_RXISCANRESET_TIME          = 0b00001,
-            p_RXPCSRESET_TIME            = 0b00001,
-            p_RXPMARESET_TIME            = 0b00011,
-
-            # RX OOB Signaling Attributes
-            p_RXOOB_CFG                  = 0b0000110,
-
-            # RX Gearbox Attributes
-            p_RXGEARBOX_EN               = "FALSE",
-            p_GEARBOX_MODE               = 0b000,
-
-            # PRBS Detection Attribute
-            p_RXPRBS_ERR_LOOPBACK        = 0b0,
-
-            # Power-Down Attributes
-            p_PD_TRANS_TIME_FROM_P2      = 0x03c,
-            p_PD_TRANS_TIME_NONE_P2      = 0x3c,
-            p_PD_TRANS_TIME_TO_P2        = 0x64,
-
-            # RX OOB Signaling Attributes
-            p_SAS_MAX_COM                = 64,
-            p_SAS_MIN_COM                = 36,
-            p_SATA_BURST_SEQ_LEN         = 0b0101,
-            p_SATA_BURST_VAL             = 0b100,
-            p_SATA_EIDLE_VAL             = 0b100,
-            p_SATA_MAX_BURST             = 8,
-            p_SATA_MAX_INIT              = 21,
-            p_SATA_MAX_WAKE              = 7,
-            p_SATA_MIN_BURST             = 4,
-            p_SATA_MIN_INIT              = 12,
-            p_SATA_MIN_WAKE              = 4,
-
-            # RX Fabric Clock Output Control Attributes
-            p_TRANS_TIME_RATE            = 0x0E,
-
-            # TX Buffer Attributes
-            p_TXBUF_EN                   = "TRUE",
-            p_TXBUF_RESET_ON_RATE_CHANGE = "TRUE",
-            p_TXDLY_CFG                  = 0x001F,
-            p_TXDLY_LCFG                 = 0x030,
-            p_TXDLY_TAP_CFG              = 0x0000,
-            p_TXPH_CFG                   = 0x0780,
-            p_TXPHDLY_CFG                = 0x084020,
-            p_TXPH_MONITOR_SEL           = 0b00000,
-            p_TX_XCLK_SEL                = "TXOUT",
-
-            # FPGA TX Interface Attributes
-            p_TX_DATA_WIDTH              = data_width,
-
-            # TX Configurable Driver Attributes
-            p_TX_DEEMPH0                 = 0b000000,
-            p_TX_DEEMPH1                 = 0b000000,
-            p_TX_EIDLE_ASSERT_DELAY      = 0b110,
-            p_TX_EIDLE_DEASSERT_DELAY    = 0b100,
-            p_TX_LOOPBACK_DRIVE_HIZ      = "FALSE",
-            p_TX_MAINCURSOR_SEL          = 0b0,
-            p_TX_DRIVE_MODE              = "DIRECT",
-            p_TX_MARGIN_FULL_0           = 0b1001110,
-            p_TX_MARGIN_FULL_1           = 0b1001001,
-            p_TX_MARGIN_FULL_2           = 0b1000101,
-            p_TX_MARGIN_FULL_3           = 0b1000010,
-            p_TX_MARGIN_FULL_4           = 0b1000000,
-            p_TX_MARGIN_LOW_0            = 0b1000110,
-            p_TX_MARGIN_LOW_1            = 0b1000100,
-            p_TX_MARGIN_LOW_2            = 0b1000010,
-            p_TX_MARGIN_LOW_3            = 0b1000000,
-            p_TX_MARGIN_LOW_4            = 0b1000000,
-
-            # TX Gearbox Attributes
-            p_TXGEARBOX_EN               = "FALSE",
-
-            # TX Initialization and Reset Attributes
-            p_TXPCSRESET_TIME            = 0b00001,
-            p_TXPMARESET_TIME            = 0b00001,
-
-            # TX Receiver Detection Attributes
-            p_TX_RXDETECT_CFG            = 0x1832,
-            p_TX_RXDETECT_REF            = 0b100,
-
-            # JTAG Attributes
-            p_ACJTAG_DEBUG_MODE          = 0b0,
-            p_ACJTAG_MODE                = 0b0,
-            p_ACJTAG_RESET               = 0b0,
-
-            # CDR Attributes
-            p_CFOK_CFG                   = 0x49000040E80,
-            p_CFOK_CFG2                  = 0b0100000,
-            p_CFOK_CFG3                  = 0b0100000,
-            p_CFOK_CFG4                  = 0b0,
-            p_CFOK_CFG5                  = 0x0,
-            p_CFOK_CFG6                  = 0b0000,
-            p_RXOSCALRESET_TIME          = 0b00011,
-            p_RXOSCALRESET_TIMEOUT       = 0b00000,
-
-            # PMA Attributes
-            p_CLK_COMMON_SWING           = 0b0,
-            p_RX_CLKMUX_EN               = 0b1,
-            p_TX_CLKMUX_EN               = 0b1,
-            p_ES_CLK_PHASE_SEL           = 0b0,
-            p_USE_PCS_CLK_PHASE_SEL      = 0b0,
-            p_PMA_RSV6                   = 0b0,
-            p_PMA_RSV7                   = 0b0,
-
-            # TX Configuration Driver Attributes
-            p_TX_PREDRIVER_MODE          = 0b0,
-            p_PMA_RSV5                   = 0b0,
-            p_SATA_PLL_CFG               = "VCO_3000MHZ",
-
-            # RX Fabric Clock Output Control Attributes
-            p_RXOUT_DIV                  = qpll.config["d"],
-
-            # TX Fabric Clock Output Control Attributes
-            p_TXOUT_DIV                  = qpll.config["d"],
-
-            # RX Phase Interpolator Attributes
-            p_RXPI_CFG0                  = 0b000,
-            p_RXPI_CFG1                  = 0b1,
-            p_RXPI_CFG2                  = 0b1,
-
-            # RX Equalizer Attributes
-            p_ADAPT_CFG0                 = 0x00000,
-            p_RXLPMRESET_TIME            = 0b0001111,
-            p_RXLPM_BIAS_STARTUP_DISABLE = 0b0,
-            p_RXLPM_CFG                  = 0b0110,
-            p_RXLPM_CFG1                 = 0b0,
-            p_RXLPM_CM_CFG               = 0b0,
-            p_RXLPM_GC_CFG               = 0b111100010,
-            p_RXLPM_GC_CFG2              = 0b001,
-            p_RXLPM_HF_CFG               = 0b00001111110000,
-            p_RXLPM_HF_CFG2              = 0b01010,
-            p_RXLPM_HF_CFG3              = 0b0000,
-            p_RXLPM_HOLD_DURING_EIDLE    = 0b0,
-            p_RXLPM_INCM_CFG             = 0b1,
-            p_RXLPM_IPCM_CFG             = 0b0,
-            p_RXLPM_LF_CFG               = 0b000000001111110000,
-            p_RXLPM_LF_CFG2              = 0b01010,
-            p_RXLPM_OSINT_CFG            = 0b100,
-
-            # TX Phase Interpolator PPM Controller Attributes
-            p_TXPI_CFG0                  = 0b00,
-            p_TXPI_CFG1                  = 0b00,
-            p_TXPI_CFG2                  = 0b00,
-            p_TXPI_CFG3                  = 0b0,
-            p_TXPI_CFG4                  = 0b0,
-            p_TXPI_CFG5                  = 0b000,
-            p_TXPI_GREY_SEL              = 0b0,
-            p_TXPI_INVSTROBE_SEL         = 0b0,
-            p_TXPI_PPMCLK_SEL            = "TXUSRCLK2",
-            p_TXPI_PPM_CFG               = 0x00,
-            p_TXPI_SYNFREQ_PPM           = 0b001,
-
-            # LOOPBACK Attributes
-            p_LOOPBACK_CFG               = 0b0,
-            p_PMA_LOOPBACK_CFG           = 0b0,
-
-            p_RX_CM_SEL                  = 0b11,
-            p_RX_CM_TRIM                 = 0b1010,
-
-            # RX OOB Signalling Attributes
-            p_RXOOB_CLK_CFG              = "FABRIC",
-
-            # TX OOB Signalling Attributes
-            p_TXOOB_CFG                  = 0b0,
-
-            # RX Buffer Attributes
-            p_RXSYNC_MULTILANE           = 0b0,
-            p_RXSYNC_OVRD                = 0b0,
-            p_RXSYNC_SKIP_DA             = 0b0,
-
-            # TX Buffer Attributes
-            p_TXSYNC_MULTILANE           = 0b0,
-            p_TXSYNC_OVRD                = 0b1,
-            p_TXSYNC_SKIP_DA             = 0b0,
-
-            # CPLL Ports
-            i_GTRSVD                = 0b0000000000000000,
-            i_PCSRSVDIN             = 0b0000000000000000,
-            i_TSTIN                 = 0b11111111111111111111,
+        # Resolve which of the quad's two PLLs feeds this channel once, up front,
+        # rather than re-testing the channel number for every affected port.
+        use_pll0     = (qpll.channel == 0)
+        sysclk_sel   = 0b00 if use_pll0 else 0b11
+        pll0_clk     = qpll.clk    if use_pll0 else 0
+        pll0_refclk  = qpll.refclk if use_pll0 else 0
+        pll1_clk     = qpll.clk    if not use_pll0 else 0
+        pll1_refclk  = qpll.refclk if not use_pll0 else 0
+
+        # Signal-bearing and configuration-dependent port values, merged over the
+        # module-level port table below.
+        overrides = {
+            # Configuration-dependent attributes.
+            ("p", "RX_DATA_WIDTH")          : data_width,
+            ("p", "TX_DATA_WIDTH")          : data_width,
+            ("p", "RXCDR_CFG")              : rxcdr_cfgs[out_div],
+            ("p", "RXOUT_DIV")              : out_div,
+            ("p", "TXOUT_DIV")              : out_div,
 
             # Channel - DRP Ports
-            i_DRPADDR               = drp_mux.addr,
-            i_DRPCLK                = drp_mux.clk,
-            i_DRPDI                 = drp_mux.di,
-            o_DRPDO                 = drp_mux.do,
-            i_DRPEN                 = drp_mux.en,
-            o_DRPRDY                = drp_mux.rdy,
-            i_DRPWE                 = drp_mux.we,
+            ("i", "DRPADDR")                : drp_mux.addr,
+            ("i", "DRPCLK")                 : drp_mux.clk,
+            ("i", "DRPDI")                  : drp_mux.di,
+            ("o", "DRPDO")                  : drp_mux.do,
+            ("i", "DRPEN")                  : drp_mux.en,
+            ("o", "DRPRDY")                 : drp_mux.rdy,
+            ("i", "DRPWE")                  : drp_mux.we,
 
             # Clocking Ports
-            i_RXSYSCLKSEL           = 0b00 if qpll.channel == 0 else 0b11,
-            i_TXSYSCLKSEL           = 0b00 if qpll.channel == 0 else 0b11,
+            ("i", "RXSYSCLKSEL")            : sysclk_sel,
+            ("i", "TXSYSCLKSEL")            : sysclk_sel,
 
             # FPGA TX Interface Datapath Configuration
-            i_TX8B10BEN             = tx_enable_8b10b,
+            ("i", "TX8B10BEN")              : tx_enable_8b10b,
 
             # GTPE2_CHANNEL Clocking Ports
-            i_PLL0CLK               = qpll.clk    if qpll.channel == 0 else 0,
-            i_PLL0REFCLK            = qpll.refclk if qpll.channel == 0 else 0,
-            i_PLL1CLK               = qpll.clk    if qpll.channel == 1 else 0,
-            i_PLL1REFCLK            = qpll.refclk if qpll.channel == 1 else 0,
+            ("i", "PLL0CLK")                : pll0_clk,
+            ("i", "PLL0REFCLK")             : pll0_refclk,
+            ("i", "PLL1CLK")                : pll1_clk,
+            ("i", "PLL1REFCLK")             : pll1_refclk,
 
             # Loopback Ports
-            i_LOOPBACK              = self.loopback,
-
-            # PCI Express Ports
-            o_PHYSTATUS             = Open(),
-            i_RXRATE                = 0,
-            o_RXVALID               = Open(),
-
-            # PMA Reserved Ports
-            i_PMARSVDIN3            = 0b0,
-            i_PMARSVDIN4            = 0b0,
+            ("i", "LOOPBACK")               : self.loopback,
 
             # Power-Down Ports
-            i_RXPD                  = Cat(rx_init.gtrxpd, rx_init.gtrxpd),
-            i_TXPD                  = 0b00,
-
-            # RX 8B/10B Decoder Ports
-            i_SETERRSTATUS          = 0,
+            ("i", "RXPD")                   : Repl(rx_init.gtrxpd, 2),
 
             # RX Initialization and Reset Ports
-            i_EYESCANRESET          = 0,
-            i_RXUSERRDY             = rx_init.rxuserrdy,
-
-            # RX Margin Analysis Ports
-            o_EYESCANDATAERROR      = Open(),
-            i_EYESCANMODE           = 0,
-            i_EYESCANTRIGGER        = 0,
+            ("i", "RXUSERRDY")              : rx_init.rxuserrdy,
 
             # Receive Ports
-            i_CLKRSVD0              = 0,
-            i_CLKRSVD1              = 0,
-            i_DMONFIFORESET         = 0,
-            i_DMONITORCLK           = 0,
-            o_RXPMARESETDONE        = rx_init.rxpmaresetdone,
-            i_SIGVALIDCLK           = lfps_logic_clk,
-
-            # Receive Ports - CDR Ports
-            i_RXCDRFREQRESET        = 0,
-            i_RXCDRHOLD             = 0,
-            o_RXCDRLOCK             = Open(),
-            i_RXCDROVRDEN           = 0,
-            i_RXCDRRESET            = 0,
-            i_RXCDRRESETRSV         = 0,
-            i_RXOSCALRESET          = 0,
-            i_RXOSINTCFG            = 0b0010,
-            o_RXOSINTDONE           = Open(),
-            i_RXOSINTHOLD           = 0,
-            i_RXOSINTOVRDEN         = 0,
-            i_RXOSINTPD             = 0,
-            o_RXOSINTSTARTED        = Open(),
-            i_RXOSINTSTROBE         = 0,
-            o_RXOSINTSTROBESTARTED  = Open(),
-            i_RXOSINTTESTOVRDEN     = 0,
-
-            # Receive Ports - Clock Correction Ports
-            o_RXCLKCORCNT           = Open(),
-
-            # Receive Ports - FPGA RX Interface Datapath Configuration
-            i_RX8B10BEN             = 1,
+            ("o", "RXPMARESETDONE")         : rx_init.rxpmaresetdone,
+            ("i", "SIGVALIDCLK")            : lfps_logic_clk,
 
             # Receive Ports - FPGA RX Interface Ports
-            o_RXDATA                = rx_data,
-            i_RXUSRCLK              = ClockSignal("rx"),
-            i_RXUSRCLK2             = ClockSignal("rx"),
-
-            # Receive Ports - Pattern Checker Ports
-            o_RXPRBSERR             = Open(),
-            i_RXPRBSSEL             = 0,
-
-            # Receive Ports - Pattern Checker ports
-            i_RXPRBSCNTRESET        = 0,
+            ("o", "RXDATA")                 : rx_data,
+            ("i", "RXUSRCLK")               : ClockSignal("rx"),
+            ("i", "RXUSRCLK2")              : ClockSignal("rx"),
 
             # Receive Ports - RX 8B/10B Decoder Ports
-            o_RXCHARISCOMMA         = Open(),
-            o_RXCHARISK             = rx_ctrl,
-            o_RXDISPERR             = rx_disp_error,
-            o_RXNOTINTABLE          = rx_code_error,
+            ("o", "RXCHARISK")              : rx_ctrl,
+            ("o", "RXDISPERR")              : rx_disp_error,
+            ("o", "RXNOTINTABLE")           : rx_code_error,
 
             # Receive Ports - RX AFE Ports
-            i_GTPRXN                = self._rx_pads.n,
-            i_GTPRXP                = self._rx_pads.p,
-            i_PMARSVDIN2            = 0b0,
-            o_PMARSVDOUT0           = Open(),
-            o_PMARSVDOUT1           = Open(),
+            ("i", "GTPRXN")                 : self._rx_pads.n,
+            ("i", "GTPRXP")                 : self._rx_pads.p,
 
             # Receive Ports - RX Buffer Bypass Ports
-            i_RXBUFRESET            = 0,
-            o_RXBUFSTATUS           = Open(),
-            i_RXDDIEN               = 0,
-            i_RXDLYBYPASS           = 1,
-            i_RXDLYEN               = 0,
-            i_RXDLYOVRDEN           = 0,
-            i_RXDLYSRESET           = rx_init.rxdlysreset,
-            o_RXDLYSRESETDONE       = rx_init.rxdlysresetdone,
-            i_RXPHALIGN             = 0,
-            o_RXPHALIGNDONE         = rxphaligndone,
-            i_RXPHALIGNEN           = 0,
-            i_RXPHDLYPD             = 0,
-            i_RXPHDLYRESET          = 0,
-            o_RXPHMONITOR           = Open(),
-            i_RXPHOVRDEN            = 0,
-            o_RXPHSLIPMONITOR       = Open(),
-            o_RXSTATUS              = Open(),
-            i_RXSYNCALLIN           = rxphaligndone,
-            o_RXSYNCDONE            = rx_init.rxsyncdone,
-            i_RXSYNCIN              = 0,
-            i_RXSYNCMODE            = 0,
-            o_RXSYNCOUT             = Open(),
+            ("i", "RXDLYSRESET")            : rx_init.rxdlysreset,
+            ("o", "RXDLYSRESETDONE")        : rx_init.rxdlysresetdone,
+            ("o", "RXPHALIGNDONE")          : rxphaligndone,
+            ("i", "RXSYNCALLIN")            : rxphaligndone,
+            ("o", "RXSYNCDONE")             : rx_init.rxsyncdone,
 
             # Receive Ports - RX Byte and Word Alignment Ports
-            o_RXBYTEISALIGNED       = Open(),
-            o_RXBYTEREALIGN         = Open(),
-            o_RXCOMMADET            = Open(),
-            i_RXCOMMADETEN          = 1,
-            i_RXMCOMMAALIGNEN       = self.rx_align,
-            i_RXPCOMMAALIGNEN       = self.rx_align,
-            i_RXSLIDE               = 0,
-
-            # Receive Ports - RX Channel Bonding Ports
-            o_RXCHANBONDSEQ         = Open(),
-            i_RXCHBONDEN            = 0,
-            i_RXCHBONDI             = 0b0000,
-            i_RXCHBONDLEVEL         = 0,
-            i_RXCHBONDMASTER        = 0,
-            o_RXCHBONDO             = Open(),
-            i_RXCHBONDSLAVE         = 0,
-
-            # Receive Ports - RX Channel Bonding Ports
-            o_RXCHANISALIGNED       = Open(),
-            o_RXCHANREALIGN         = Open(),
-
-            # Receive Ports - RX Decision Feedback Equalizer
-            o_DMONITOROUT           = Open(),
-            i_RXADAPTSELTEST        = 0,
-            i_RXDFEXYDEN            = 0,
-            i_RXOSINTEN             = 0b1,
-            i_RXOSINTID0            = 0,
-            i_RXOSINTNTRLEN         = 0,
-            o_RXOSINTSTROBEDONE     = Open(),
-
-            # Receive Ports - RX Driver,OOB signalling,Coupling and Eq.,CDR
-            i_RXLPMLFOVRDEN         = 0,
-            i_RXLPMOSINTNTRLEN      = 0,
+            ("i", "RXMCOMMAALIGNEN")        : self.rx_align,
+            ("i", "RXPCOMMAALIGNEN")        : self.rx_align,
 
             # Receive Ports - RX Equalizer Ports
-            i_RXLPMHFHOLD           = ~self.train_equalizer,
-            i_RXLPMHFOVRDEN         = 0,
-            i_RXLPMLFHOLD           = ~self.train_equalizer,
-            i_RXOSHOLD              = 0,
-            i_RXOSOVRDEN            = 0,
-
-            # Receive Ports - RX Fabric ClocK Output Control Ports
-            o_RXRATEDONE            = Open(),
-
-            # Receive Ports - RX Fabric Clock Output Control Ports
-            i_RXRATEMODE            = 0b0,
+            ("i", "RXLPMHFHOLD")            : ~self.train_equalizer,
+            ("i", "RXLPMLFHOLD")            : ~self.train_equalizer,
 
             # Receive Ports - RX Fabric Output Control Ports
-            o_RXOUTCLK              = self.rxoutclk,
-            o_RXOUTCLKFABRIC        = Open(),
-            o_RXOUTCLKPCS           = Open(),
-            i_RXOUTCLKSEL           = 0b010,
-
-            # Receive Ports - RX Gearbox Ports
-            o_RXDATAVALID           = Open(),
-            o_RXHEADER              = Open(),
-            o_RXHEADERVALID         = Open(),
-            o_RXSTARTOFSEQ          = Open(),
-            i_RXGEARBOXSLIP         = 0,
+            ("o", "RXOUTCLK")               : self.rxoutclk,
 
             # Receive Ports - RX Initialization and Reset Ports
-            i_GTRXRESET             = rx_init.gtrxreset,
-            i_RXLPMRESET            = 0,
-            i_RXOOBRESET            = 0,
-            i_RXPCSRESET            = 0,
-            i_RXPMARESET            = 0,
+            ("i", "GTRXRESET")              : rx_init.gtrxreset,
 
             # Receive Ports - RX OOB Signaling ports
-            o_RXCOMSASDET           = Open(),
-            o_RXCOMWAKEDET          = Open(),
-            o_RXCOMINITDET          = Open(),
-            o_RXELECIDLE            = self.rx_idle,
-            i_RXELECIDLEMODE        = 0b00,
+            ("o", "RXELECIDLE")             : self.rx_idle,
 
             # Receive Ports - RX Polarity Control Ports
-            i_RXPOLARITY            = self.rx_polarity,
+            ("i", "RXPOLARITY")             : self.rx_polarity,
 
             # Receive Ports -RX Initialization and Reset Ports
-            o_RXRESETDONE           = rx_init.rxresetdone,
-
-            # TX Buffer Bypass Ports
-            i_TXPHDLYTSTCLK         = 0,
-
-            # TX Configurable Driver Ports
-            i_TXPOSTCURSOR          = 0b00000,
-            i_TXPOSTCURSORINV       = 0,
-            i_TXPRECURSOR           = 0b00000,
-            i_TXPRECURSORINV        = 0,
-
-            # TX Fabric Clock Output Control Ports
-            i_TXRATEMODE            = 0,
+            ("o", "RXRESETDONE")            : rx_init.rxresetdone,
 
             # TX Initialization and Reset Ports
-            i_CFGRESET              = 0,
-            i_GTTXRESET             = tx_init.gttxreset,
+            ("i", "GTTXRESET")              : tx_init.gttxreset,
             #o_PCSRSVDOUT           = Open(),
-            i_TXUSERRDY             = tx_init.txuserrdy,
-
-            # TX Phase Interpolator PPM Controller Ports
-            i_TXPIPPMEN             = 0,
-            i_TXPIPPMOVRDEN         = 0,
-            i_TXPIPPMPD             = 0,
-            i_TXPIPPMSEL            = 1,
-            i_TXPIPPMSTEPSIZE       = 0,
-
-            # Transceiver Reset Mode Operation
-            i_GTRESETSEL            = 0,
-            i_RESETOVRD             = 0,
-
-            # Transmit Ports
-            #o_TXPMARESETDONE       = Open(),
-
-            # Transmit Ports - Configurable Driver Ports
-            i_PMARSVDIN0            = 0b0,
-            i_PMARSVDIN1            = 0b0,
+            ("i", "TXUSERRDY")              : tx_init.txuserrdy,
 
             # Transmit Ports - FPGA TX Interface Ports
-            i_TXDATA                = tx_data,
-            i_TXUSRCLK              = ClockSignal("tx"),
-            i_TXUSRCLK2             = ClockSignal("tx"),
+            ("i", "TXDATA")                 : tx_data,
+            ("i", "TXUSRCLK")               : ClockSignal("tx"),
+            ("i", "TXUSRCLK2")              : ClockSignal("tx"),
 
             # Transmit Ports - PCI Express Ports
-            i_TXELECIDLE            = self.tx_idle,
-            i_TXMARGIN              = 0,
-            i_TXRATE                = 0,
-            i_TXSWING               = 0,
-
-            # Transmit Ports - Pattern Generator Ports
-            i_TXPRBSFORCEERR        = 0,
+            ("i", "TXELECIDLE")             : self.tx_idle,
 
             # Transmit Ports - TX 8B/10B Encoder Ports
-            i_TX8B10BBYPASS         = 0,
-            i_TXCHARDISPMODE        = tx_char_disp_mode,
-            i_TXCHARDISPVAL         = tx_char_disp_val,
-            i_TXCHARISK             = tx_ctrl,
+            ("i", "TXCHARDISPMODE")         : tx_char_disp_mode,
+            ("i", "TXCHARDISPVAL")          : tx_char_disp_val,
+            ("i", "TXCHARISK")              : tx_ctrl,
 
             # Transmit Ports - TX Buffer Bypass Ports
-            i_TXDLYBYPASS           = 1,
-            i_TXDLYEN               = tx_init.txdlyen,
-            i_TXDLYHOLD             = 0,
-            i_TXDLYOVRDEN           = 0,
-            i_TXDLYSRESET           = tx_init.txdlysreset,
-            o_TXDLYSRESETDONE       = tx_init.txdlysresetdone,
-            i_TXDLYUPDOWN           = 0,
-            i_TXPHALIGN             = tx_init.txphalign,
-            o_TXPHALIGNDONE         = tx_init.txphaligndone,
-            i_TXPHALIGNEN           = 0,
-            i_TXPHDLYPD             = 0,
-            i_TXPHDLYRESET          = 0,
-            i_TXPHINIT              = tx_init.txphinit,
-            o_TXPHINITDONE          = tx_init.txphinitdone,
-            i_TXPHOVRDEN            = 0,
-
-            # Transmit Ports - TX Buffer Ports
-            o_TXBUFSTATUS           = Open(),
-
-            # Transmit Ports - TX Buffer and Phase Alignment Ports
-            i_TXSYNCALLIN           = 0,
-            o_TXSYNCDONE            = Open(),
-            i_TXSYNCIN              = 0,
-            i_TXSYNCMODE            = 0,
-            o_TXSYNCOUT             = Open(),
+            ("i", "TXDLYEN")                : tx_init.txdlyen,
+            ("i", "TXDLYSRESET")            : tx_init.txdlysreset,
+            ("o", "TXDLYSRESETDONE")        : tx_init.txdlysresetdone,
+            ("i", "TXPHALIGN")              : tx_init.txphalign,
+            ("o", "TXPHALIGNDONE")          : tx_init.txphaligndone,
+            ("i", "TXPHINIT")               : tx_init.txphinit,
+            ("o", "TXPHINITDONE")           : tx_init.txphinitdone,
 
             # Transmit Ports - TX Configurable Driver Ports
-            o_GTPTXN                = self._tx_pads.n,
-            o_GTPTXP                = self._tx_pads.p,
-            i_TXBUFDIFFCTRL         = 0b100,
-            i_TXDEEMPH              = 0,
-            i_TXDIFFCTRL            = 0b1000,
-            i_TXDIFFPD              = 0,
-            i_TXINHIBIT             = self.tx_inhibit,
-            i_TXMAINCURSOR          = 0b0000000,
-            i_TXPISOPD              = 0,
+            ("o", "GTPTXN")                 : self._tx_pads.n,
+            ("o", "GTPTXP")                 : self._tx_pads.p,
+            ("i", "TXINHIBIT")              : self.tx_inhibit,
 
             # Transmit Ports - TX Fabric Clock Output Control Ports
-            o_TXOUTCLK              = self.txoutclk,
-            o_TXOUTCLKFABRIC        = Open(),
-            o_TXOUTCLKPCS           = Open(),
-            i_TXOUTCLKSEL           = 0b010,
-            o_TXRATEDONE            = Open(),
-
-            # Transmit Ports - TX Gearbox Ports
-            o_TXGEARBOXREADY        = Open(),
-            i_TXHEADER              = 0,
-            i_TXSEQUENCE            = 0,
-            i_TXSTARTSEQ            = 0,
+            ("o", "TXOUTCLK")               : self.txoutclk,
 
             # Transmit Ports - TX Initialization and Reset Ports
-            i_TXPCSRESET            = 0,
-            i_TXPMARESET            = 0,
-            o_TXRESETDONE           = tx_init.txresetdone,
-
-            # Transmit Ports - TX OOB signalling Ports
-            o_TXCOMFINISH           = Open(),
-            i_TXCOMINIT             = 0,
-            i_TXCOMSAS              = 0,
-            i_TXCOMWAKE             = 0,
-            i_TXPDELECIDLEMODE      = 0,
+            ("o", "TXRESETDONE")            : tx_init.txresetdone,
 
             # Transmit Ports - TX Polarity Control Ports
-            i_TXPOLARITY            = self.tx_polarity,
+            ("i", "TXPOLARITY")             : self.tx_polarity,
+        }
 
-            # Transmit Ports - TX Receiver Detection Ports
-            i_TXDETECTRX            = 0,
+        # Unused status/debug outputs, left open when a design asks for them.
+        open_ports = []
+        if self.INCLUDE_DEBUG_PORTS:
+            open_ports = [("o", name, Open()) for name in self._DEBUG_OUTPUT_PORTS]
 
-            # Transmit Ports - pattern Generator Ports
-            i_TXPRBSSEL             = 0,
-        )
+        dynamic_ports = [(kind, name, overrides[kind, name])
+                         for kind, name in _GTP_DYNAMIC_PORTS]
+
+        m.submodules.gtp = Instance("GTPE2_CHANNEL",
+            *_GTP_STATIC_PORTS, *dynamic_ports, *open_ports)
 
         #
         # TX clocking
@@ -1328,13 +1663,7 @@ class GTP(Elaboratable):
         tx_reset_deglitched = Signal()
         #tx_reset_deglitched.attr.add("no_retiming")
         m.d.ss += tx_reset_deglitched.eq(~tx_init.done)
-        m.domains.tx = ClockDomain()
-
-        m.submodules += Instance("BUFG",
-            i_I = self.txoutclk,
-            o_O = ClockSignal("tx")
-        )
-        m.submodules += ResetSynchronizer(tx_reset_deglitched, domain="tx")
+        _add_output_clock_domain(m, "tx", self.txoutclk, tx_reset_deglitched)
 
         #
         # RX clocking
@@ -1342,14 +1671,7 @@ class GTP(Elaboratable):
         rx_reset_deglitched = Signal()
         #rx_reset_deglitched.attr.add("no_retiming")
         m.d.tx += rx_reset_deglitched.eq(~rx_init.done)
-        m.domains.rx = ClockDomain()
-        m.submodules += [
-            Instance("BUFG",
-                i_I = self.rxoutclk,
-                o_O = ClockSignal("rx")
-            ),
-            ResetSynchronizer(rx_reset_deglitched, domain="rx")
-        ]
+        _add_output_clock_domain(m, "rx", self.rxoutclk, rx_reset_deglitched)
 
         #
         # Tx Datapath
@@ -1359,30 +1681,19 @@ class GTP(Elaboratable):
         m.d.comb += self.sink.ready.eq(1)
 
         # If we're in Tx-GPIO mode, we'll allow the user to drive a value directly onto the
-        # Tx output buffer. This is necessary to allow LFPS signaling.
-        with m.If(tx_gpio_en):
-            m.d.comb += [
-                # Disable 8B10B drive, so we can control our transmit value directly.
-                tx_enable_8b10b   .eq(0),
-
-                # Constantly drive a full bus of our Tx GPIO value, so we scan out its value,
-                # effectively driving the Tx lines to that value.
-                tx_data           .eq(Repl(tx_gpio, len(tx_data))),
-                tx_ctrl           .eq(0),
-                tx_char_disp_mode .eq(Repl(tx_gpio, len(tx_char_disp_mode))),
-                tx_char_disp_val  .eq(Repl(tx_gpio, len(tx_char_disp_val)))
-            ]
-        with m.Else():
-            m.d.comb += [
-                # Enable 8b10b for our normal data...
-                tx_enable_8b10b   .eq(1),
-
-                # ... and provide that data to the SerDes' transmitter.
-                tx_data           .eq(self.sink.data),
-                tx_ctrl           .eq(self.sink.ctrl),
-                tx_char_disp_mode .eq(0),
-                tx_char_disp_val  .eq(0)
-            ]
+        # Tx output buffer; this is necessary to allow LFPS signaling. In that mode, 8B10B
+        # drive is disabled, and we constantly drive a full bus of our Tx GPIO value, so we
+        # scan out its value -- effectively driving the Tx lines to that value. Otherwise,
+        # we enable 8B10B and provide the sink's data to the SerDes' transmitter.
+        gpio_wide_data = Repl(tx_gpio, len(tx_data))
+        gpio_wide_ctrl = Repl(tx_gpio, nwords)
+        m.d.comb += [
+            tx_enable_8b10b   .eq(~tx_gpio_en),
+            tx_data           .eq(Mux(tx_gpio_en, gpio_wide_data, self.sink.data)),
+            tx_ctrl           .eq(Mux(tx_gpio_en, 0, self.sink.ctrl)),
+            tx_char_disp_mode .eq(Mux(tx_gpio_en, gpio_wide_ctrl, 0)),
+            tx_char_disp_val  .eq(Mux(tx_gpio_en, gpio_wide_ctrl, 0))
+        ]
 
 
         #
@@ -1393,22 +1704,20 @@ class GTP(Elaboratable):
         # (Decoding errors are still valid stream words; but are replaced with SUB).
         m.d.comb += self.source.valid.eq(1)
 
-        # ... and then assign their values to our output bus.
-        for i in range(nwords):
-
-            # If 8B10B decoding failed on the given byte, replace it with our substitution character.
-            with m.If(rx_code_error[i]):
-                m.d.comb += [
-                    self.source.data.word_select(i, 8)  .eq(SUB.value),
-                    self.source.ctrl[i]                 .eq(SUB.ctrl),
-                ]
-
-            # Otherwise, pass it through directly.
-            with m.Else():
-                m.d.comb += [
-                    self.source.data.word_select(i, 8)  .eq(rx_data.word_select(i, 8)),
-                    self.source.ctrl[i]                 .eq(rx_ctrl[i])
-                ]
+        # ... and then assign their values to our output bus. Each byte passes through
+        # directly; unless 8B10B decoding failed on it, in which case we replace it with
+        # our substitution character. A flat Cat-of-Mux expression keeps this a simple
+        # per-byte mux, rather than a pile of prioritized conditionals.
+        m.d.comb += [
+            self.source.data.eq(Cat(
+                Mux(rx_code_error[i], _SUB_VALUE, rx_data.word_select(i, 8))
+                for i in range(nwords)
+            )),
+            self.source.ctrl.eq(Cat(
+                Mux(rx_code_error[i], _SUB_CTRL, rx_ctrl[i])
+                for i in range(nwords)
+            ))
+        ]
 
         return m
 
@@ -1490,31 +1799,31 @@ class LunaArtix7SerDes(Elaboratable):
             rx_pads            = self._rx_pads,
             ss_clock_frequency = self._ss_clock_frequency
         )
-        m.d.comb += self.ready.eq(serdes.tx_ready & serdes.rx_ready),
-
-
         #
         # Transmit datapath.
         #
         m.submodules.tx_datapath = tx_datapath = TransmitPreprocessing()
-        m.d.comb += [
-            serdes.tx_idle             .eq(self.tx_idle),
-            serdes.tx_enable           .eq(self.enable),
-            serdes.tx_polarity         .eq(self.tx_polarity),
-
-            tx_datapath.sink           .stream_eq(self.sink),
-            serdes.sink                .stream_eq(tx_datapath.source),
-
-            serdes.tx_gpio_en          .eq(self.use_tx_as_gpio),
-            serdes.tx_gpio             .eq(self.tx_gpio)
-        ]
-
 
         #
         # Receive datapath.
         #
         m.submodules.rx_datapath = rx_datapath = ReceivePostprocessing()
+
         m.d.comb += [
+            self.ready                    .eq(serdes.tx_ready & serdes.rx_ready),
+
+            # Transmit datapath.
+            serdes.tx_idle                .eq(self.tx_idle),
+            serdes.tx_enable              .eq(self.enable),
+            serdes.tx_polarity            .eq(self.tx_polarity),
+
+            tx_datapath.sink              .stream_eq(self.sink),
+            serdes.sink                   .stream_eq(tx_datapath.source),
+
+            serdes.tx_gpio_en             .eq(self.use_tx_as_gpio),
+            serdes.tx_gpio                .eq(self.tx_gpio),
+
+            # Receive datapath.
             self.rx_idle                  .eq(serdes.rx_idle),
 
             serdes.rx_enable              .eq(self.enable),
@@ -4,12 +4,9 @@
 # Copyright (c) 2021 Great Scott Gadgets <info@greatscottgadgets.com>
 # SPDX-License-Identifier: BSD-3-Clause
 
-import logging
-
-from abc import ABC
 from nmigen import *
 
-class BucatiniPHY(Elaboratable, ABC):
+class BucatiniPHY(Elaboratable):
     """ Abstract base class for Bucatini soft PIPE implementations. 
     
     Currently compliant with the PHY Interface for PCI Express, revision 3.0,
@@ -31,15 +28,32 @@ class BucatiniPHY(Elaboratable, ABC):
         8 : 0b10
     }
 
+    # Widths derived from our own interface width; subclasses get theirs resolved
+    # in __init_subclass__, below.
+    _DATA_BUS_WIDTH_CONST = Const(_DATA_BUS_WIDTHS[INTERFACE_WIDTH], 2)
+    _DATA_WIDTH           = INTERFACE_WIDTH * 8
+    _CTRL_WIDTH           = INTERFACE_WIDTH * 1
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+
+        # Resolve each subclass' interface width once, as the subclass is created,
+        # rather than on every instantiation -- this also reports an unsupported
+        # width as soon as the offending subclass is defined.
+        if cls.INTERFACE_WIDTH not in cls._DATA_BUS_WIDTHS:
+            raise ValueError(f"Bucatini does not support a data bus width of {cls.INTERFACE_WIDTH}!")
+        cls._DATA_BUS_WIDTH_CONST = Const(cls._DATA_BUS_WIDTHS[cls.INTERFACE_WIDTH], 2)
+
+        # ... and pre-compute the widths of the class' data and control signals.
+        cls._DATA_WIDTH = cls.INTERFACE_WIDTH * 8
+        cls._CTRL_WIDTH = cls.INTERFACE_WIDTH * 1
+
+
     def __init__(self, invert_reset=True):
 
-        # Ensure we have a valid interface width.
-        if self.INTERFACE_WIDTH not in self._DATA_BUS_WIDTHS:
-            raise ValueError(f"Bucatini does not support a data bus width of {self.INTERFACE_WIDTH}!")
-        
-        # Compute the width of our data and control signals for this class.
-        data_width = self.INTERFACE_WIDTH * 8
-        ctrl_width = self.INTERFACE_WIDTH * 1
+        # The widths of our data and control signals, resolved per-class, above.
+        data_width = self._DATA_WIDTH
+        ctrl_width = self._CTRL_WIDTH
 
         #
         # PIPE interface standard.
@@ -53,7 +67,7 @@ class BucatiniPHY(Elaboratable, ABC):
         self.elas_buf_mode    = Signal()
         self.power_down       = Signal(2)
         self.pwrpresent       = Signal()
-        self.data_bus_width   = Const(self._DATA_BUS_WIDTHS[self.INTERFACE_WIDTH], width=2)
+        self.data_bus_width   = self._DATA_BUS_WIDTH_CONST
 
         # Transmit bus.
         self.tx_clk           = Signal()
@@ -77,7 +91,10 @@ class BucatiniPHY(Elaboratable, ABC):
         self.rx_valid         = Signal()
 
         # Receiver configuration & status.
-        self.rx_status        = Array((Signal(3), Signal(3)))
+        # Lane status signals are indexed with compile-time-constant lane numbers, so a
+        # plain tuple suffices; anyone who needs dynamic indexing can wrap it in an
+        # Array() at the point of use.
+        self.rx_status        = tuple(Signal(3, name=f"rx_status{i}") for i in range(2))
         self.rx_polarity      = Signal()
         self.rx_elecidle      = Signal()
         self.rx_termination   = Signal()